@@ -0,0 +1,23 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Measure CLI startup so import-time regressions show up.
+# Usage: scripts/bench_startup.sh [python]
+
+PY="${1:-python3}"
+cd "$(dirname "$0")/.."
+export PYTHONPATH="src${PYTHONPATH:+:$PYTHONPATH}"
+
+echo "Top imports by cumulative time (us):"
+PYTHONPROFILEIMPORTTIME=1 "$PY" -c "import openssmide.cli" 2> import.log
+sort -t'|' -k2 -n -r import.log | head -15
+echo "(full log in import.log)"
+echo ""
+
+if command -v hyperfine &>/dev/null; then
+  hyperfine --warmup 3 "$PY -m openssmide.cli --help"
+else
+  for _ in 1 2 3 4 5; do
+    "$PY" -c "import time, subprocess, sys; t = time.perf_counter(); subprocess.run([sys.executable, '-c', 'import openssmide.cli'], check=True); print(f'import openssmide.cli: {(time.perf_counter() - t) * 1000:.0f} ms')"
+  done
+fi
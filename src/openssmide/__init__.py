@@ -1 +1,29 @@
-__all__ = []
+import importlib
+
+# Public names resolved on first access (PEP 562) so importing the package,
+# or `openssmide.cli` for `--help`, doesn't pull in openai/pymongo/Quartz.
+_LAZY_ATTRS = {
+    "take_screenshot_and_analyze": ".ss_ai",
+    "ask_gpt": ".ss_ai",
+    "ask_followup": ".ss_ai",
+    "general_ask": ".ss_ai",
+    "interactive_chat": ".ss_shell",
+    "quick_voice_input": ".voice",
+    "load_config": ".config",
+    "save_config": ".config",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
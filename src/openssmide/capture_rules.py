@@ -1,42 +1,86 @@
 import subprocess
+import time
 from pathlib import Path
 
 import Quartz
+from Foundation import NSURL
 
 TARGET_OWNERS = {
-    "chrome": ["google chrome", "chrome"],
-    "powerpoint": ["microsoft powerpoint", "powerpoint"],
-    "word": ["microsoft word", "word"],
+    "chrome": frozenset({"google chrome", "chrome"}),
+    "powerpoint": frozenset({"microsoft powerpoint", "powerpoint"}),
+    "word": frozenset({"microsoft word", "word"}),
 }
+_TERMINAL_OWNERS = frozenset({"terminal", "iterm2", "iterm"})
+
+# Resolve PyObjC's lazily-loaded framework attributes once, not on every capture.
+_copy_window_info = Quartz.CGWindowListCopyWindowInfo
+_create_window_image = Quartz.CGWindowListCreateImage
+_ON_SCREEN_ONLY = Quartz.kCGWindowListOptionOnScreenOnly
+_NULL_WINDOW_ID = Quartz.kCGNullWindowID
+_INCLUDING_WINDOW = Quartz.kCGWindowListOptionIncludingWindow
+# Full Retina resolution, as `screencapture -l` produced; callers shrink copies as needed.
+_WINDOW_IMAGE_OPTIONS = (
+    Quartz.kCGWindowImageBoundsIgnoreFraming | Quartz.kCGWindowImageBestResolution
+)
+
+
+# Window snapshots are reused for a short window so detect + capture share one
+# trip across the Quartz bridge.
+_SNAPSHOT_TTL = 0.05
+_snapshot = (0.0, None)
 
 
 def _list_onscreen_windows():
-    return Quartz.CGWindowListCopyWindowInfo(
-        Quartz.kCGWindowListOptionOnScreenOnly,
-        Quartz.kCGNullWindowID,
-    )
+    global _snapshot
+    taken_at, windows = _snapshot
+    now = time.monotonic()
+    if windows is None or now - taken_at > _SNAPSHOT_TTL:
+        windows = _copy_window_info(_ON_SCREEN_ONLY, _NULL_WINDOW_ID)
+        _snapshot = (now, windows)
+    return windows
+
+
+# (display_id, x, y, width, height) for each active display, main display first.
+# Cleared at the start of every capture: nothing here runs a run loop, so Quartz's
+# reconfiguration callback would never fire and a cached layout could go stale.
+_display_cache = None
+
+
+def invalidate_display_cache():
+    global _display_cache
+    _display_cache = None
+
+
+def _display_geometry():
+    global _display_cache
+    if _display_cache is None:
+        _, display_ids, count = Quartz.CGGetActiveDisplayList(16, None, None)
+        geometry = []
+        for display_id in (display_ids or ())[:count]:
+            rect = Quartz.CGDisplayBounds(display_id)
+            geometry.append(
+                (display_id, rect.origin.x, rect.origin.y, rect.size.width, rect.size.height)
+            )
+        if not geometry:
+            main = Quartz.CGDisplayBounds(Quartz.CGMainDisplayID())
+            geometry.append(
+                (Quartz.CGMainDisplayID(), main.origin.x, main.origin.y, main.size.width, main.size.height)
+            )
+        _display_cache = geometry
+    return _display_cache
 
 
 def _display_id_for_bounds(bounds):
+    displays = _display_geometry()
     if not bounds:
-        return Quartz.CGMainDisplayID()
-    rect = Quartz.CGRectMake(
-        bounds["X"], bounds["Y"], bounds["Width"], bounds["Height"]
-    )
-    display_id = Quartz.CGMainDisplayID()
-    try:
-        result = Quartz.CGGetDisplaysWithRect(rect, 1, None)
-        if isinstance(result, tuple) and len(result) >= 3:
-            _, count, displays = result
-            if count and displays:
-                display_id = displays[0]
-        elif isinstance(result, tuple) and len(result) == 2:
-            count, displays = result
-            if count and displays:
-                display_id = displays[0]
-    except Exception:
-        pass
-    return display_id
+        return displays[0][0]
+    # Assign the window to the display containing its centre.
+    cx = bounds["X"] + bounds["Width"] / 2
+    cy = bounds["Y"] + bounds["Height"] / 2
+    for display_id, x, y, width, height in displays:
+        if x <= cx < x + width and y <= cy < y + height:
+            return display_id
+    return displays[0][0]
 
 
 def _normalize_target(target: str) -> str:
@@ -60,20 +104,19 @@ def _is_usable_window(window_info):
     return True
 
 
+def _owner_name(window_info):
+    return (window_info.get("kCGWindowOwnerName") or "").lower()
+
+
 def _owner_matches(window_info, owner_names):
-    owner = (window_info.get("kCGWindowOwnerName") or "").lower()
-    return owner in owner_names
+    return _owner_name(window_info) in owner_names
 
 
-def _find_window_by_owner(owner_names, prefer_title_contains=None):
-    windows = _list_onscreen_windows()
-    candidates = []
-    for w in windows:
-        if not _is_usable_window(w):
-            continue
-        if not _owner_matches(w, owner_names):
-            continue
-        candidates.append(w)
+def _find_window_by_owner(windows, owner_names, prefer_title_contains=None):
+    candidates = [
+        w for w in windows
+        if _owner_name(w) in owner_names and _is_usable_window(w)
+    ]
 
     if not candidates:
         return None
@@ -90,12 +133,10 @@ def _find_window_by_owner(owner_names, prefer_title_contains=None):
         bounds = w.get("kCGWindowBounds") or {}
         return bounds.get("Width", 0) * bounds.get("Height", 0)
 
-    candidates.sort(key=area, reverse=True)
-    return candidates[0]
+    return max(candidates, key=area)
 
 
-def _process_running(owner_names):
-    windows = _list_onscreen_windows()
+def _process_running(windows, owner_names):
     for w in windows:
         if _owner_matches(w, owner_names):
             return True
@@ -103,13 +144,30 @@ def _process_running(owner_names):
 
 def detect_active_target() -> str:
     """Detects which of the supported apps is currently open."""
+    present = {_owner_name(w) for w in _list_onscreen_windows()}
     for target_key, owner_names in TARGET_OWNERS.items():
-        if _process_running(owner_names):
+        if not present.isdisjoint(owner_names):
             return target_key
     return "chrome"  # fallback default
 
 
+def _write_window_png(win_id, out_path: Path) -> bool:
+    """Capture a single window in-process, skipping the screencapture fork/exec."""
+    image = _create_window_image(
+        Quartz.CGRectNull, _INCLUDING_WINDOW, win_id, _WINDOW_IMAGE_OPTIONS
+    )
+    if image is None:
+        return False
+    url = NSURL.fileURLWithPath_(str(out_path))
+    dest = Quartz.CGImageDestinationCreateWithURL(url, "public.png", 1, None)
+    if dest is None:
+        return False
+    Quartz.CGImageDestinationAddImage(dest, image, None)
+    return bool(Quartz.CGImageDestinationFinalize(dest))
+
+
 def capture_active_window(out_path: Path, target="chrome", full_slide=False):
+    invalidate_display_cache()
     target_key = _normalize_target(target)
     owner_names = TARGET_OWNERS[target_key]
     if target_key == "powerpoint":
@@ -119,14 +177,15 @@ def capture_active_window(out_path: Path, target="chrome", full_slide=False):
     else:
         target_display_name = "Chrome"
 
-    if not _process_running(owner_names):
+    windows = _list_onscreen_windows()
+    if not _process_running(windows, owner_names):
         return (
             False,
             f"{target_display_name} process/window not found. Open {target_display_name} and try again.",
         )
 
     preferred_title = "slide show" if target_key == "powerpoint" and full_slide else None
-    app_window = _find_window_by_owner(owner_names, prefer_title_contains=preferred_title)
+    app_window = _find_window_by_owner(windows, owner_names, prefer_title_contains=preferred_title)
     if not app_window:
         return (
             False,
@@ -141,7 +200,7 @@ def capture_active_window(out_path: Path, target="chrome", full_slide=False):
                 "No PowerPoint Slide Show window found. Start Slide Show mode to capture full-slide view.",
             )
 
-    term_window = _find_window_by_owner(["terminal", "iterm2", "iterm"])
+    term_window = _find_window_by_owner(windows, _TERMINAL_OWNERS)
     if not term_window:
         return False, "Terminal window not found."
 
@@ -160,10 +219,15 @@ def capture_active_window(out_path: Path, target="chrome", full_slide=False):
     if not win_id:
         return False, f"{target_display_name} window ID not found."
 
-    subprocess.run(
-        ["screencapture", "-x", "-l", str(win_id), str(out_path)],
-        check=True,
-    )
+    try:
+        captured = _write_window_png(win_id, out_path)
+    except Exception:
+        captured = False
+    if not captured:
+        subprocess.run(
+            ["screencapture", "-x", "-l", str(win_id), str(out_path)],
+            check=True,
+        )
     return True, None
 
 
@@ -1,16 +1,69 @@
-from datetime import datetime, timedelta
+import os
+import shutil
+import threading
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 SCREEN_DIR = Path.home() / ".ss_ai"
 RETENTION_DAYS = 3
 
+_cleanup_started = False
+
+
+def _is_day_dir(name: str) -> bool:
+    try:
+        date.fromisoformat(name)
+    except ValueError:
+        return False
+    return True
+
 
 def cleanup_old_screens():
-    cutoff = datetime.utcnow() - timedelta(days=RETENTION_DAYS)
-    for f in SCREEN_DIR.glob("*.png"):
-        try:
-            mtime = datetime.utcfromtimestamp(f.stat().st_mtime)
-            if mtime < cutoff:
-                f.unlink()
-        except Exception:
-            pass
+    # Screenshots live in SCREEN_DIR/YYYY-MM-DD/, so whole days are dropped at once;
+    # ISO dates compare correctly as strings.
+    cutoff_day = (date.today() - timedelta(days=RETENTION_DAYS)).isoformat()
+    cutoff_ts = (datetime.now() - timedelta(days=RETENTION_DAYS)).timestamp()
+    try:
+        entries = os.scandir(SCREEN_DIR)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name == "cache":
+                    _remove_older_than(entry.path, ".json", cutoff_ts)
+                elif entry.name < cutoff_day and _is_day_dir(entry.name):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                continue
+            # Flat PNGs from before the per-day layout.
+            if entry.name.endswith(".png"):
+                _unlink_if_older(entry, cutoff_ts)
+
+
+def _unlink_if_older(entry, cutoff_ts: float):
+    try:
+        if entry.stat().st_mtime < cutoff_ts:
+            os.unlink(entry.path)
+    except OSError:
+        pass
+
+
+def _remove_older_than(path: str, suffix: str, cutoff_ts: float):
+    # Capture cache entries (see ss_ai) expire with the screenshots they describe.
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.endswith(suffix):
+                _unlink_if_older(entry, cutoff_ts)
+
+
+def start_background_cleanup():
+    """Run cleanup_old_screens() once per process on a daemon thread so startup doesn't wait on it."""
+    global _cleanup_started
+    if _cleanup_started:
+        return
+    _cleanup_started = True
+    threading.Thread(target=cleanup_old_screens, name="openssmide-cleanup", daemon=True).start()
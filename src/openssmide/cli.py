@@ -1,72 +1,76 @@
+"""
+OpenSS command-line interface.
+
+Heavy dependencies (openai, pymongo, Quartz, rich widgets) are imported inside
+the commands that need them so `openssmide --help` stays fast. To check for
+startup regressions:
+
+    PYTHONPROFILEIMPORTTIME=1 openssmide --help 2> import.log
+    hyperfine "openssmide --help"
+
+or run scripts/bench_startup.sh.
+"""
 import typer
 from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.table import Table
-from rich.status import Status
-from rich.prompt import Prompt, Confirm
+import functools
 import os
+import re
 import sys
-import subprocess
-import time
-import readline
 from pathlib import Path
-from bson import ObjectId
-
-from .ss_ai import (
-    take_screenshot_and_analyze,
-    build_context,
-    ask_followup,
-    ask_prompt,
-    extract_first_code_block,
-    copy_to_clipboard,
-    general_ask,
-    handle_ai_response,
-    require_api_key,
-)
-from .ss_shell import load_context, ask_llm, list_sessions, open_latest_session, interactive_chat
-from .db import add_message, create_session
-from .config import load_config, AVAILABLE_MODELS, save_config
-from .voice import quick_voice_input
-from .word_automation import (
-    open_document,
-    read_active_document,
-    write_active_document,
-    save_active_document,
+
+from .config import CONFIG_PATH, PROJECT_ROOT, get_cached_config, load_config, AVAILABLE_MODELS, save_config
+
+app = typer.Typer(
+    help="OpenSS: AI-powered screenshot analysis and chat.",
+    no_args_is_help=False,
 )
+# Markup stays on for [red]/[bold] tags; auto-highlighting and emoji codes are unused.
+console = Console(highlight=False, emoji=False)
 
-app = typer.Typer(help="OpenSS: AI-powered screenshot analysis and chat.")
-console = Console()
-CONFIG = load_config()
 
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
 ENV_PATH = PROJECT_ROOT / ".env"
 
+# KEY=value per line; comment lines never match the identifier anchor.
+_ENV_LINE_RE = re.compile(r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.M)
+
+# (st_mtime_ns, parsed pairs) of the last .env read or write.
+_env_cache = None
+
 
 def _read_env() -> dict:
     """Read the .env file into a dict."""
-    if not ENV_PATH.exists():
+    global _env_cache
+    try:
+        mtime_ns = ENV_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
-    pairs = {}
-    for line in ENV_PATH.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" in line:
-            k, v = line.split("=", 1)
-            pairs[k.strip()] = v.strip()
-    return pairs
+    if _env_cache is None or _env_cache[0] != mtime_ns:
+        _env_cache = (mtime_ns, dict(_ENV_LINE_RE.findall(ENV_PATH.read_text())))
+    # Callers mutate the result before writing it back.
+    return dict(_env_cache[1])
 
 
 def _write_env(pairs: dict):
     """Write a dict back to .env."""
-    lines = [f"{k}={v}" for k, v in pairs.items() if v]
-    lines.append("")
-    ENV_PATH.write_text("\n".join(lines))
+    global _env_cache
+    data = "".join(f"{k}={v}\n" for k, v in pairs.items() if v).encode("utf-8")
+    # One write to a private temp file, then an atomic rename over .env so a
+    # crash mid-write can't leave truncated credentials behind.
+    tmp_path = ENV_PATH.with_name(ENV_PATH.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.fchmod(fd, 0o600)
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, ENV_PATH)
+    _env_cache = (ENV_PATH.stat().st_mtime_ns, {k: v for k, v in pairs.items() if v})
 
 
 def _run_setup():
     """Prompt for provider API keys and optional MongoDB URI, write to .env."""
+    from rich.prompt import Prompt
+
     console.print()
     console.print("  [bold green]● OpenSS Setup[/bold green]")
     console.print("  ───────────────────")
@@ -118,6 +122,8 @@ def setup():
 @app.command()
 def apikey():
     """Change your OpenAI or Anthropic API keys."""
+    from rich.prompt import Prompt
+
     env = _read_env()
     
     current_openai = env.get("OPENAI_API_KEY", "")
@@ -155,6 +161,8 @@ def apikey():
 @app.command()
 def anthropic():
     """Change your Anthropic API key."""
+    from rich.prompt import Prompt
+
     env = _read_env()
     current = env.get("ANTHROPIC_API_KEY", "")
     masked = current[:6] + "..." + current[-4:] if len(current) > 10 else "(not set)"
@@ -175,6 +183,8 @@ def anthropic():
 @app.command()
 def mongo():
     """Set or change your MongoDB URI."""
+    from rich.prompt import Prompt
+
     env = _read_env()
     current = env.get("MONGO_URI", "")
 
@@ -207,7 +217,7 @@ def mongo():
 @app.command()
 def uninstall():
     """Remove OpenSS from your system."""
-    import shutil
+    from rich.prompt import Prompt
 
     console.print()
     console.print("  [bold red]● OpenSS Uninstall[/bold red]")
@@ -232,7 +242,15 @@ def uninstall():
     # Remove install dir (only if it's ~/.openss — don't nuke a dev checkout)
     install_dir = Path.home() / ".openss"
     if PROJECT_ROOT == install_dir and install_dir.exists():
-        shutil.rmtree(install_dir)
+        if sys.platform != "win32":
+            import subprocess
+
+            # rm walks the tree in C; the venv alone is thousands of files.
+            subprocess.run(["rm", "-rf", str(install_dir)], check=True)
+        else:
+            import shutil
+
+            shutil.rmtree(install_dir)
         console.print(f"  [dim]✓ Removed {install_dir}[/dim]")
     else:
         console.print(f"  [dim]⚠ Skipped {PROJECT_ROOT} (not a standard install)[/dim]")
@@ -242,40 +260,47 @@ def uninstall():
     console.print()
 
 
-SKIP_SETUP_CMDS = ("setup", "update", "uninstall", "apikey", "anthropic", "mongo")
+_WELCOME_TITLE = "[bold green]Welcome to OpenSS[/bold green]"
+_WELCOME_BODY = (
+    "[bold]What it does[/bold]\n"
+    "Capture a Chrome, PowerPoint, or Word window, extract text with macOS OCR, and answer with GPT.\n\n"
+    "[bold]Commands[/bold]\n"
+    "`openssmide capture`  Capture active window (Chrome/PowerPoint/Word) and answer\n"
+    "`openssmide word`     Read/ask/edit active Microsoft Word document\n"
+    "`openssmide voice`    Ask by voice (native macOS speech-to-text)\n"
+    "`openssmide model`    Switch AI models (OpenAI/Claude)\n"
+    "`openssmide update`   Pull latest code and update dependencies\n\n"
+    "[bold]Docs[/bold]\n"
+    "Interfaces: `INTERFACES.md`"
+)
+
+SKIP_SETUP_CMDS = frozenset({"setup", "update", "uninstall", "apikey", "anthropic", "mongo"})
 
 
 @app.callback(invoke_without_command=True)
 def _welcome(ctx: typer.Context):
     if ctx.invoked_subcommand is not None:
         # Auto-trigger setup if .env is missing (except for management commands)
-        if not ENV_PATH.exists() and ctx.invoked_subcommand not in SKIP_SETUP_CMDS:
+        if ctx.invoked_subcommand not in SKIP_SETUP_CMDS and not _read_env():
             console.print()
             console.print("  [yellow]First-time setup required.[/yellow]")
             _run_setup()
         return
 
+    # Scripted/piped runs can't use the interactive menu; show usage instead.
+    if not sys.stdout.isatty():
+        typer.echo(ctx.get_help())
+        raise typer.Exit(0)
+
     # If no command given, check for .env first
-    if not ENV_PATH.exists():
+    if not _read_env():
         _run_setup()
         return
 
     from rich.panel import Panel
+    from rich.prompt import Prompt
 
-    title = "[bold green]Welcome to OpenSS[/bold green]"
-    body = (
-        "[bold]What it does[/bold]\n"
-        "Capture a Chrome, PowerPoint, or Word window, extract text with macOS OCR, and answer with GPT.\n\n"
-        "[bold]Commands[/bold]\n"
-        "`openssmide capture`  Capture active window (Chrome/PowerPoint/Word) and answer\n"
-        "`openssmide word`     Read/ask/edit active Microsoft Word document\n"
-        "`openssmide voice`    Ask by voice (native macOS speech-to-text)\n"
-        "`openssmide model`    Switch AI models (OpenAI/Claude)\n"
-        "`openssmide update`   Pull latest code and update dependencies\n\n"
-        "[bold]Docs[/bold]\n"
-        "Interfaces: `INTERFACES.md`"
-    )
-    console.print(Panel(body, title=title, border_style="green"))
+    console.print(Panel(_WELCOME_BODY, title=_WELCOME_TITLE, border_style="green"))
 
     choice = Prompt.ask(
         "[bold blue]Start[/bold blue] (capture/word/voice/model/update/exit)",
@@ -294,10 +319,11 @@ def _welcome(ctx: typer.Context):
     else:
         return
 
-@app.command()
-def model():
-    """Switch between different AI models."""
+@functools.lru_cache(maxsize=1)
+def _models_table():
+    """AVAILABLE_MODELS is static, so the picker table is built once per process."""
     from rich.table import Table
+
     table = Table(title="Available AI Models")
     table.add_column("#", style="cyan")
     table.add_column("Provider", style="yellow")
@@ -306,10 +332,25 @@ def model():
 
     for i, m in enumerate(AVAILABLE_MODELS, 1):
         table.add_row(str(i), m.get("provider", "openai"), m["id"], m["desc"])
+    return table
 
-    console.print(table)
-    choice = Prompt.ask("Select model number", choices=[str(i) for i in range(1, len(AVAILABLE_MODELS) + 1)])
-    selected = AVAILABLE_MODELS[int(choice) - 1]
+
+@app.command()
+def model():
+    """Switch between different AI models."""
+    from rich.prompt import Prompt
+
+    console.print(_models_table())
+    while True:
+        raw = Prompt.ask("Select model number")
+        try:
+            idx = int(raw)
+        except ValueError:
+            idx = 0
+        if 1 <= idx <= len(AVAILABLE_MODELS):
+            break
+        console.print("[red]Invalid choice[/red]")
+    selected = AVAILABLE_MODELS[idx - 1]
     env = _read_env()
     provider = selected.get("provider", "openai")
     if provider == "anthropic" and not env.get("ANTHROPIC_API_KEY"):
@@ -325,6 +366,22 @@ def model():
     console.print(f"[bold green]Switched to {selected['name']}![/bold green]")
 
 
+def _daemon_capture(title, target, full_slide):
+    """Run a capture in the background daemon; returns None when no daemon is running."""
+    from .daemon import request as daemon_request
+
+    reply = daemon_request(
+        {"cmd": "capture", "title": title, "target": target, "full_slide": full_slide}
+    )
+    if reply is None:
+        return None
+    if not reply.get("ok"):
+        return None, reply.get("error")
+    from bson import ObjectId
+
+    return ObjectId(reply["session_id"]), (reply["text"], reply["answer"], Path(reply["image_path"]))
+
+
 @app.command()
 def capture(
     title: str = typer.Option(None, "--title", "-t", help="Session title"),
@@ -338,7 +395,11 @@ def capture(
     ),
 ):
     """Capture a screenshot, analyze it with AI, and optionally start a chat."""
-    cfg = load_config()
+    from rich.status import Status
+    from .ss_ai import take_screenshot_and_analyze, build_context, ask_followup, handle_ai_response
+    from .ss_shell import interactive_chat
+    from .db import add_messages
+
     if target is None:
         from .capture_rules import detect_active_target
         capture_target = detect_active_target()
@@ -352,6 +413,7 @@ def capture(
     # Handle Voice Input for Question
     voice_question = None
     if voice:
+        from .voice import quick_voice_input
         console.print("[bold green]Listening for your question (5s)...[/bold green]")
         voice_question, err = quick_voice_input(5)
         if err:
@@ -360,26 +422,30 @@ def capture(
             console.print(f"[bold blue]Question:[/bold blue] {voice_question}")
 
     with Status(f"[bold blue]Capturing {capture_target} and analyzing...", console=console) as status:
-        session_id, result = take_screenshot_and_analyze(
-            title,
-            target=capture_target,
-            full_slide=full_slide,
-        )
-        
+        daemon_result = _daemon_capture(title, capture_target, full_slide)
+        if daemon_result is not None:
+            session_id, result = daemon_result
+        else:
+            session_id, result = take_screenshot_and_analyze(
+                title,
+                target=capture_target,
+                full_slide=full_slide,
+            )
+
+        if session_id:
+            text, ans, img = result
+
+            # If we have a voice question, perform a follow-up immediately
+            if voice_question:
+                status.update("[bold blue]Analyzing voice question...")
+                ctx = build_context(session_id)
+                ans = ask_followup(ctx, voice_question, session_id=session_id)
+                add_messages(session_id, [("user", voice_question), ("assistant", ans)])
+
     if not session_id:
         console.print(f"[red]{result}[/red]")
         return
 
-    text, ans, img = result
-    
-    # If we have a voice question, perform a follow-up immediately
-    if voice_question:
-        with Status("[bold blue]Analyzing voice question...", console=console):
-            ctx = build_context(session_id)
-            ans = ask_followup(ctx, voice_question)
-            add_message(session_id, "user", voice_question)
-            add_message(session_id, "assistant", ans)
-
     handle_ai_response(ans, console)
 
     if chat:
@@ -387,6 +453,22 @@ def capture(
         interactive_chat(session_id)
 
 
+def _wait_for_word_document(name: str, read_active_document, timeout: float = 1.0) -> bool:
+    """Poll until Word reports `name` as the active document; False if it doesn't within `timeout` seconds."""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            title, _ = read_active_document()
+            if name.lower() in (title or "").lower():
+                return True
+        except Exception:
+            pass
+        time.sleep(0.05)
+    return False
+
+
 @app.command()
 def word(
     action: str = typer.Option(
@@ -414,6 +496,11 @@ def word(
     ),
 ):
     """Read, ask, write, or AI-edit the active Microsoft Word document."""
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+    from rich.status import Status
+    from .word_automation import open_document, read_active_document, write_active_document
+
     action = (action or "read").strip().lower()
     if action not in ("read", "ask", "write", "edit"):
         console.print("[red]Invalid --action. Use: read, ask, write, edit.[/red]")
@@ -422,10 +509,13 @@ def word(
     if file:
         try:
             open_document(Path(file))
-            time.sleep(0.25)
         except Exception as e:
             console.print(f"[red]Failed to open file in Word: {e}[/red]")
             return
+        # Never read or edit whichever document was active before Word switched.
+        if not _wait_for_word_document(Path(file).stem, read_active_document):
+            console.print(f"[red]Word did not open {file} within 1s; try again once it has loaded.[/red]")
+            return
 
     try:
         title, doc_text = read_active_document()
@@ -433,7 +523,7 @@ def word(
         console.print(f"[red]{e}[/red]")
         return
 
-    cfg = load_config()
+    cfg = get_cached_config()
     max_chars = int(cfg.get("max_word_chars", 40000))
     if len(doc_text) > max_chars and action in ("ask", "edit"):
         console.print(
@@ -449,6 +539,8 @@ def word(
         if not instruction:
             console.print("[red]Missing --instruction for --action ask.[/red]")
             return
+        from .ss_ai import ask_prompt, require_api_key
+
         require_api_key()
         prompt = cfg["prompt_word_question"].format(
             doc_title=title,
@@ -475,6 +567,8 @@ def word(
         if not instruction:
             console.print("[red]Missing --instruction for --action edit.[/red]")
             return
+        from .ss_ai import ask_prompt, require_api_key
+
         require_api_key()
         prompt = cfg["prompt_word_edit"].format(
             doc_title=title,
@@ -498,6 +592,13 @@ def write(
     chat: bool = typer.Option(True, "--chat/--no-chat", help="Enter interactive chat to edit the document after writing")
 ):
     """Interactively prompt the AI to generate content and write it into the active Microsoft Word document."""
+    from rich.prompt import Prompt
+    from rich.status import Status
+    from .word_automation import read_active_document, write_active_document
+    from .ss_ai import ask_prompt, handle_ai_response
+    from .ss_shell import interactive_chat
+    from .db import add_messages, create_session
+
     try:
         # Just check if Word is running/active document exists.
         read_active_document()
@@ -512,7 +613,7 @@ def write(
 
     with Status("[dim]Generating content...", console=console):
         # We can use the configured general prompt but modify it slightly for purely writing tasks
-        cfg = load_config()
+        cfg = get_cached_config()
         # Direct instruction ensures it only returns the requested text without chatty filler
         instruction = f"Write the following content directly without markdown formatting (unless specified), conversational filler, or intro/outro text:\n\n{prompt_text}"
         ans = ask_prompt(instruction, cfg["model"])
@@ -529,8 +630,7 @@ def write(
     # Create session
     title = f"Word Write: {prompt_text[:30]}..."
     session_id = create_session(title)
-    add_message(session_id, "user", prompt_text)
-    add_message(session_id, "assistant", ans)
+    add_messages(session_id, [("user", prompt_text), ("assistant", ans)])
 
     if chat:
         console.print("\n[bold]Entering follow-up chat to edit the document. Press Ctrl+C or Enter on empty line to exit.[/bold]")
@@ -539,6 +639,10 @@ def write(
 @app.command()
 def summarize():
     """Extract text from the active Microsoft Word document and summarize it using AI."""
+    from rich.status import Status
+    from .word_automation import read_active_document
+    from .ss_ai import ask_prompt, handle_ai_response
+
     try:
         title, doc_text = read_active_document()
     except Exception as e:
@@ -549,7 +653,7 @@ def summarize():
         console.print("[red]The active Word document is empty.[/red]")
         return
 
-    cfg = load_config()
+    cfg = get_cached_config()
     max_chars = int(cfg.get("max_word_chars", 40000))
     if len(doc_text) > max_chars:
         console.print(
@@ -569,6 +673,8 @@ def chat(
     session_id: str = typer.Option(None, "--id", "-i", help="Session ID to open")
 ):
     """Open an existing session for chat."""
+    from .ss_shell import open_latest_session, interactive_chat
+
     if not session_id:
         latest = open_latest_session()
         if not latest:
@@ -576,6 +682,8 @@ def chat(
             return
         current_id = latest
     else:
+        from bson import ObjectId
+
         try:
             current_id = ObjectId(session_id)
         except Exception:
@@ -590,6 +698,9 @@ def history(
     limit: int = typer.Option(10, "--limit", "-l", help="Number of sessions to show")
 ):
     """Show history of analysis sessions."""
+    from rich.table import Table
+    from .db import list_sessions
+
     sessions = list_sessions(limit)
     if not sessions:
         console.print("[yellow]No history found.[/yellow]")
@@ -611,13 +722,15 @@ def config(
     value: str = typer.Argument(None, help="New value for the key")
 ):
     """View or update configuration."""
-    import json
-    config_path = Path(__file__).resolve().parents[2] / "config.json"
-    
+    from rich.table import Table
+    from .config import json_dumps, json_loads
+
+    config_path = CONFIG_PATH
+
     if key and value:
         # Update config
         try:
-            current_config = json.loads(config_path.read_text())
+            current_config = json_loads(config_path.read_bytes())
             # Try to parse value as int or bool if possible
             if value.lower() == "true": val = True
             elif value.lower() == "false": val = False
@@ -625,7 +738,7 @@ def config(
             else: val = value
             
             current_config[key] = val
-            config_path.write_text(json.dumps(current_config, indent=4))
+            config_path.write_bytes(json_dumps(current_config, indent=True))
             console.print(f"[green]Updated {key} to {val}[/green]")
         except Exception as e:
             console.print(f"[red]Error updating config: {e}[/red]")
@@ -635,18 +748,35 @@ def config(
     table.add_column("Key", style="cyan")
     table.add_column("Value", style="green")
 
-    for k, v in CONFIG.items():
+    for k, v in get_cached_config().items():
         table.add_row(k, str(v))
 
     console.print(table)
     console.print("\n[dim]To update use: openssmide config <key> <value>[/dim]")
 
+
+def _discard_session(session_future):
+    """Deletes a session created ahead of an answer that never arrived."""
+    from .db import delete_session
+
+    try:
+        delete_session(session_future.result())
+    except Exception:
+        pass
+
+
 @app.command()
 def voice(
     duration: int = typer.Option(5, "--duration", "-d", help="Recording duration in seconds"),
     chat: bool = typer.Option(True, "--chat/--no-chat", help="Enter interactive chat after query")
 ):
     """Voice command: Ask a question verbally and get an AI response. Optionally start a chat."""
+    from .voice import quick_voice_input
+    from .ss_ai import general_ask, handle_ai_response, stream_answer
+    from .ss_shell import interactive_chat
+    from .db import add_messages, create_session
+    from concurrent.futures import ThreadPoolExecutor
+
     console.print(f"[bold green]Listening for {duration}s...[/bold green]")
     text, err = quick_voice_input(duration)
     if err:
@@ -655,16 +785,20 @@ def voice(
     if text:
         console.print(f"\n[bold blue]You said:[/bold blue] {text}")
         
-        with Status("[dim]Thinking...", console=console):
-            ans = general_ask(text)
-            
-        handle_ai_response(ans, console)
-        
-        # Create session
+        # Create the session while the model is answering.
         title = f"Voice: {text[:30]}..."
-        session_id = create_session(title)
-        add_message(session_id, "user", text)
-        add_message(session_id, "assistant", ans)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            session_future = pool.submit(create_session, title)
+            try:
+                ans = stream_answer(general_ask, text, console=console)
+            except BaseException:
+                _discard_session(session_future)
+                raise
+            session_id = session_future.result()
+
+        handle_ai_response(ans, console)
+
+        add_messages(session_id, [("user", text), ("assistant", ans)])
 
         if chat:
             console.print("\n[bold]Entering follow-up chat. Press Ctrl+C or Enter on empty line to exit.[/bold]")
@@ -678,37 +812,132 @@ def ask(
     chat: bool = typer.Option(True, "--chat/--no-chat", help="Enter interactive chat after query")
 ):
     """Directly ask the AI a question (supports multi-line stdin). Optionally start a chat."""
+    from rich.status import Status
+    from .ss_ai import general_ask, handle_ai_response, stream_answer
+    from .ss_shell import interactive_chat
+    from .db import add_messages, create_session
+    from concurrent.futures import ThreadPoolExecutor
+
     q = question
     if not q:
-        import sys
         if sys.stdin.isatty():
             console.print("[bold yellow]Direct Input Mode:[/bold yellow] Type/paste your question and press [bold]Ctrl+D[/bold] (Mac/Linux) or [bold]Ctrl+Z[/bold] (Windows) to finish.")
-        q = sys.stdin.read().strip()
+        q = sys.stdin.buffer.read().decode("utf-8", "replace").strip()
         
     if not q:
         console.print("[red]No question provided.[/red]")
         return
 
-    with Status("[dim]Thinking...", console=console):
-        ans = general_ask(q)
-        
-    handle_ai_response(ans, console)
-    
-    # Create session
+    from .daemon import request as daemon_request
+
+    # Create the session while the model is answering.
     title = f"Ask: {q[:30]}..."
-    session_id = create_session(title)
-    add_message(session_id, "user", q)
-    add_message(session_id, "assistant", ans)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        session_future = pool.submit(create_session, title)
+        try:
+            with Status("[dim]Thinking...", console=console):
+                reply = daemon_request({"cmd": "ask", "question": q})
+            if reply is None:
+                ans = stream_answer(general_ask, q, console=console)
+            elif reply.get("ok"):
+                ans = reply["answer"]
+            else:
+                ans = None
+        except BaseException:
+            _discard_session(session_future)
+            raise
+        if ans is None:
+            # Don't leave an empty session behind for `chat` to resume.
+            _discard_session(session_future)
+            console.print(f"[red]{reply.get('error')}[/red]")
+            return
+        session_id = session_future.result()
+
+    handle_ai_response(ans, console)
+
+    add_messages(session_id, [("user", q), ("assistant", ans)])
 
     if chat:
         console.print("\n[bold]Entering follow-up chat. Press Ctrl+C or Enter on empty line to exit.[/bold]")
         interactive_chat(session_id)
 
 
+@app.command()
+def daemon(
+    action: str = typer.Argument("status", help="start, stop, or status")
+):
+    """Keep OpenSS warm in the background so capture/ask skip startup costs."""
+    from . import daemon as daemon_mod
+
+    action = (action or "status").strip().lower()
+    if action == "start":
+        if daemon_mod.start():
+            console.print("[green]Daemon running.[/green]")
+        else:
+            console.print("[red]Daemon failed to start.[/red]")
+    elif action == "stop":
+        if daemon_mod.stop():
+            console.print("[green]Daemon stopped.[/green]")
+        else:
+            console.print("[yellow]Daemon is not running.[/yellow]")
+    elif action == "status":
+        if daemon_mod.is_running():
+            console.print(f"[green]Daemon running[/green] [dim]({daemon_mod.SOCKET_PATH})[/dim]")
+        else:
+            console.print("[yellow]Daemon is not running.[/yellow]")
+    else:
+        console.print("[red]Invalid action. Use: start, stop, status.[/red]")
+
+
+def _file_digest(path: Path):
+    import hashlib
+
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+# Digest of the requirements.txt last installed successfully into this environment.
+_REQUIREMENTS_MARKER = Path(sys.prefix) / ".openss-requirements.sha256"
+
+
+def _installed_requirements_digest():
+    try:
+        return _REQUIREMENTS_MARKER.read_text().strip()
+    except OSError:
+        return None
+
+
+def _run_with_progress(cmd, progress, task, start: float, end: float):
+    """Run cmd, easing the progress bar from start towards end as it prints output; returns the output."""
+    import subprocess
+
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+    completed = start
+    output = []
+    for line in proc.stdout:
+        output.append(line)
+        completed += (end - completed) * 0.1
+        progress.update(task, completed=completed)
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output="".join(output))
+    progress.update(task, completed=end)
+    return "".join(output)
+
+
 @app.command()
 def update():
     """Pull latest code and update dependencies."""
-    root = Path(__file__).resolve().parents[2]
+    import subprocess
+
+    root = PROJECT_ROOT
     try:
         from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn
 
@@ -721,26 +950,45 @@ def update():
         ) as progress:
             task = progress.add_task("Updating OpenSS", total=100)
 
+            requirements = root / "requirements.txt"
+
             progress.update(task, completed=5)
-            subprocess.run(
-                ["git", "-C", str(root), "pull", "origin", "main"],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+            pull_output = _run_with_progress(
+                [
+                    "git", "-C", str(root),
+                    "-c", "protocol.version=2", "-c", "gc.auto=0",
+                    "--no-optional-locks",
+                    "pull", "--ff-only", "origin", "main",
+                ],
+                progress, task, 5, 50,
             )
-            progress.update(task, completed=50)
 
-            subprocess.run(
-                [sys.executable, "-m", "pip", "install", "-r", str(root / "requirements.txt")],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
+            if "Already up to date" in pull_output:
+                progress.update(task, description="Already up to date")
+            # Reinstall only when requirements.txt differs from the last successful
+            # install, so an install that failed earlier is retried.
+            digest = _file_digest(requirements)
+            if digest is not None and digest != _installed_requirements_digest():
+                _run_with_progress(
+                    [
+                        sys.executable, "-m", "pip", "install",
+                        "--disable-pip-version-check", "--prefer-binary",
+                        "-r", str(requirements),
+                    ],
+                    progress, task, 50, 100,
+                )
+                try:
+                    _REQUIREMENTS_MARKER.write_text(digest)
+                except OSError:
+                    pass
             progress.update(task, completed=100)
 
         console.print("[bold green]Update complete.[/bold green]")
     except subprocess.CalledProcessError as e:
         console.print(f"[red]Update failed:[/red] {e}")
+        # Output is captured for the progress bar, so show the tail that explains the failure.
+        for line in (e.output or "").strip().splitlines()[-5:]:
+            console.print(line, style="dim", markup=False, highlight=False)
 
 if __name__ == "__main__":
     app()
@@ -1,16 +1,38 @@
+import functools
 import json
 from pathlib import Path
+from types import MappingProxyType
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-DEFAULT_CONFIG = {
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CONFIG_PATH = PROJECT_ROOT / "config.json"
+
+DEFAULT_CONFIG = MappingProxyType({
     "model": "gpt-4.1-nano",
     "autocopy": True,
     "autocopy_mode": "answer",  # "answer" or "code"
     "max_ocr_preview": 800,
     "max_context_chars": 8000,
     "ocr_languages": ["en-US"],
-    "ocr_recognition_level": "accurate",  # "accurate" or "fast"
+    "ocr_recognition_level": "fast",  # "fast" or "accurate"
+    "ocr_accurate_fallback": True,  # retry "fast" OCR at "accurate" when it finds nothing
+    "ocr_downscale": True,  # OCR a copy shrunk to ocr_max_edge px on the long side
+    "ocr_max_edge": 1600,
     "debug_ocr": False,
+    "min_ocr_bytes": 1024,  # watcher ignores screenshot files smaller than this
+    "ocr_in_prompt": True,  # False: send the screenshot alone and run OCR alongside the request
+    "split_questions": False,  # True: ask each numbered OCR question in parallel
+    "downscale_for_llm": True,  # Shrink screenshots before sending them to the model
+    "llm_image_max_edge": 1568,
+    "reuse_cached_answers": True,  # Replay the earlier answer for a byte-identical screenshot
+    # Reuse the previous answer when the screen looks unchanged. Off by default: a
+    # small edit (one changed digit) can fall under the threshold.
+    "reuse_similar_capture": False,
+    "similar_capture_distance": 4,  # max differing bits of 64 in the screenshot dHash
     "prompt_main": (
         "OCR TEXT:\n{text}\n\n"
         "TASK:\n"
@@ -32,16 +54,18 @@ DEFAULT_CONFIG = {
         "- For MCQ, give option letter/number plus a short reason.\n"
         "- If missing info, say \"Missing info: ...\".\n"
     ),
+    # Static instructions first and the growing conversation after, so consecutive
+    # turns share a byte-identical prefix that the provider can serve from its prompt cache.
     "prompt_followup": (
+        "Answer the user's follow-up clearly and concisely.\n\n"
         "Conversation so far:\n{context}\n\n"
-        "User follow-up:\n{question}\n\n"
-        "Answer clearly and concisely."
+        "User follow-up:\n{question}"
     ),
     "prompt_general": (
         "User question: {question}\n\n"
         "Answer clearly and concisely."
     ),
-}
+})
 
 AVAILABLE_MODELS = [
     {"id": "gpt-4o-mini", "name": "GPT-4o mini", "desc": "Fast, smart, and extremely cheap (Best for most tasks)"},
@@ -50,18 +74,63 @@ AVAILABLE_MODELS = [
     {"id": "gpt-4-turbo", "name": "GPT-4 Turbo", "desc": "Reliable older flagship. More expensive"},
 ]
 
+# Menu numbers accepted by the model pickers ("1".."N").
+MODEL_CHOICES = [str(i) for i in range(1, len(AVAILABLE_MODELS) + 1)]
+
+
+def json_loads(data):
+    """Parse JSON bytes/str with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes with orjson when available (indent=True: 2 spaces)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=4)
+def _load_user_config(path_str: str, mtime_ns: int) -> dict:
+    # mtime_ns is part of the cache key so edits to config.json invalidate it.
+    return json_loads(Path(path_str).read_bytes())
+
 
 def load_config():
-    path = Path(__file__).resolve().parents[2] / "config.json"
-    if not path.exists():
-        return DEFAULT_CONFIG
     try:
-        user_cfg = json.loads(path.read_text())
+        st = CONFIG_PATH.stat()
+    except OSError:
+        return dict(DEFAULT_CONFIG)
+    try:
+        user_cfg = _load_user_config(str(CONFIG_PATH), st.st_mtime_ns)
         return {**DEFAULT_CONFIG, **user_cfg}
     except Exception:
-        return DEFAULT_CONFIG
+        return dict(DEFAULT_CONFIG)
+
+
+_config_cache = None  # (mtime_ns, merged config)
+
+
+def get_cached_config():
+    """
+    Returns the merged config, reusing one dict until config.json changes.
+
+    The dict is shared between callers, so treat it as read-only; use
+    load_config() to get a copy to edit and save.
+    """
+    global _config_cache
+    try:
+        mtime_ns = CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    if _config_cache is None or _config_cache[0] != mtime_ns:
+        _config_cache = (mtime_ns, load_config())
+    return _config_cache[1]
 
 
 def save_config(new_config):
-    path = Path(__file__).resolve().parents[2] / "config.json"
-    path.write_text(json.dumps(new_config, indent=4))
+    global _config_cache
+    CONFIG_PATH.write_bytes(json_dumps(new_config, indent=True))
+    _config_cache = None
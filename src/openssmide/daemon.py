@@ -0,0 +1,180 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .config import json_dumps, json_loads
+
+SOCKET_PATH = Path.home() / ".ss_ai" / "openssmide.sock"
+START_TIMEOUT = 10.0
+CONNECT_TIMEOUT = 1.0
+# Long enough for a capture plus a model answer. Past it the CLI reports an error rather
+# than re-running a request the daemon may still be working on.
+REPLY_TIMEOUT = 120.0
+RECV_TIMEOUT = 5.0  # for reading a request; clients send it all at once
+
+
+def _handle(req: dict) -> dict:
+    cmd = req.get("cmd")
+    if cmd == "ping":
+        return {"ok": True, "pid": os.getpid()}
+
+    if cmd == "ask":
+        from .ss_ai import general_ask
+
+        return {"ok": True, "answer": general_ask(req["question"])}
+
+    if cmd == "capture":
+        from .ss_ai import take_screenshot_and_analyze
+
+        session_id, result = take_screenshot_and_analyze(
+            req.get("title"),
+            target=req.get("target"),
+            full_slide=req.get("full_slide", False),
+        )
+        if not session_id:
+            return {"ok": False, "error": result}
+        text, ans, img = result
+        return {
+            "ok": True,
+            "session_id": str(session_id),
+            "text": text,
+            "answer": ans,
+            "image_path": str(img),
+        }
+
+    return {"ok": False, "error": f"Unknown daemon command: {cmd}"}
+
+
+def _recv_all(conn) -> bytes:
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _serve_request(conn, req: dict):
+    from .db import flush_messages
+
+    with conn:
+        try:
+            reply = _handle(req)
+            flush_messages()
+        except (Exception, SystemExit) as e:
+            reply = {"ok": False, "error": str(e).strip()}
+        try:
+            conn.sendall(json_dumps(reply))
+        except OSError:
+            pass  # the client gave up waiting
+
+
+def serve():
+    """Run the daemon loop, keeping clients and imports resident between requests."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    if SOCKET_PATH.exists():
+        SOCKET_PATH.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(SOCKET_PATH))
+    os.chmod(SOCKET_PATH, 0o600)
+    server.listen(4)
+    # Captures and asks run one at a time on the worker; this loop stays free to
+    # answer ping/stop so `daemon status` never queues behind a slow request.
+    worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="openssmide-daemon")
+    try:
+        while True:
+            conn, _ = server.accept()
+            try:
+                conn.settimeout(RECV_TIMEOUT)
+                req = json_loads(_recv_all(conn) or b"{}")
+                conn.settimeout(None)
+            except (OSError, ValueError):
+                conn.close()
+                continue
+            cmd = req.get("cmd")
+            if cmd in ("stop", "ping"):
+                with conn:
+                    reply = {"ok": True} if cmd == "stop" else _handle(req)
+                    try:
+                        conn.sendall(json_dumps(reply))
+                    except OSError:
+                        pass
+                if cmd == "stop":
+                    break
+                continue
+            worker.submit(_serve_request, conn, req)
+    finally:
+        worker.shutdown(wait=False)
+        server.close()
+        if SOCKET_PATH.exists():
+            SOCKET_PATH.unlink()
+
+
+def request(payload: dict):
+    """
+    Sends a request to the running daemon.
+
+    Returns:
+        dict | None: The daemon's reply, or None if no daemon is listening.
+        Once connected, failures come back as an {"ok": False} reply so callers
+        don't repeat a request the daemon may still be running.
+    """
+    if not SOCKET_PATH.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(SOCKET_PATH))
+        except OSError:
+            return None
+        sock.settimeout(REPLY_TIMEOUT)
+        try:
+            sock.sendall(json_dumps(payload))
+            sock.shutdown(socket.SHUT_WR)
+            return json_loads(_recv_all(sock) or b"null")
+        except socket.timeout:
+            return {"ok": False, "error": f"Daemon busy or timed out after {REPLY_TIMEOUT:.0f}s."}
+        except (OSError, ValueError) as e:
+            return {"ok": False, "error": f"Daemon request failed: {e}"}
+    finally:
+        sock.close()
+
+
+def is_running() -> bool:
+    reply = request({"cmd": "ping"})
+    return bool(reply and reply.get("ok"))
+
+
+def start() -> bool:
+    """Spawn a detached daemon process and wait for its socket to answer."""
+    if is_running():
+        return True
+    subprocess.Popen(
+        [sys.executable, "-m", "openssmide.daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if is_running():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def stop() -> bool:
+    return request({"cmd": "stop"}) is not None
+
+
+if __name__ == "__main__":
+    serve()
@@ -1,29 +1,174 @@
+import atexit
+import functools
+import hashlib
 import os
-from datetime import datetime
-
-from pymongo import MongoClient
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
 
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
 DB_NAME = "ss_ai"
 
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
+# Records (a digest of) the URI whose indexes were created, so later processes skip the round trips.
+INDEX_MARKER = Path.home() / ".ss_ai" / "mongo_indexes"
+
+_client = None
+_client_uri = None
+
+
+def _get_client():
+    """Create the MongoClient on first use; pymongo connects on the first operation."""
+    global _client, _client_uri
+    if _client is None:
+        from dotenv import load_dotenv
+        from pymongo import MongoClient
+
+        from .config import PROJECT_ROOT
+
+        # Commands like `history` import only this module; pick up MONGO_URI from .env too.
+        load_dotenv(PROJECT_ROOT / ".env")
+        _client_uri = os.getenv("MONGO_URI", MONGO_URI)
+        _client = MongoClient(_client_uri, connect=False)
+    return _client
+
+
+@functools.lru_cache(maxsize=None)
+def _get_collections():
+    from pymongo import ASCENDING, DESCENDING
+
+    database = _get_client()[DB_NAME]
+    sessions, messages = database.sessions, database.messages
+    # Keep a digest rather than the URI itself, which may hold credentials.
+    uri_digest = hashlib.sha256(_client_uri.encode()).hexdigest()
+    try:
+        indexed = INDEX_MARKER.read_text() == uri_digest
+    except OSError:
+        indexed = False
+    if not indexed:
+        # These back the two read queries below. Creating them is a no-op once they
+        # exist, but still a round trip each, so only do it once per database.
+        messages.create_index([("session_id", ASCENDING), ("timestamp", ASCENDING)])
+        sessions.create_index([("last_active", DESCENDING)])
+        try:
+            INDEX_MARKER.parent.mkdir(parents=True, exist_ok=True)
+            INDEX_MARKER.write_text(uri_digest)
+        except OSError:
+            pass
+    return sessions, messages
+
 
-sessions = db.sessions
-messages = db.messages
+def __getattr__(name):
+    # Keep `db.client`, `db.sessions`, ... working without connecting at import.
+    if name == "client":
+        return _get_client()
+    if name == "db":
+        return _get_client()[DB_NAME]
+    if name == "sessions":
+        return _get_collections()[0]
+    if name == "messages":
+        return _get_collections()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def create_session(title: str):
+    sessions, _ = _get_collections()
+    now = datetime.utcnow()
     doc = {
         "title": title,
-        "created_at": datetime.utcnow(),
-        "last_active": datetime.utcnow(),
+        "created_at": now,
+        "last_active": now,
     }
-    return sessions.insert_one(doc).inserted_id
+    session_id = sessions.insert_one(doc).inserted_id
+    # A new session has no messages yet, so follow-ups never need to query it.
+    _message_cache[session_id] = []
+    return session_id
+
+
+def delete_session(session_id):
+    """Removes a session and its messages, e.g. one created for an answer that never arrived."""
+    sessions, messages = _get_collections()
+    messages.delete_many({"session_id": session_id})
+    sessions.delete_one({"_id": session_id})
+    _message_cache.pop(session_id, None)
+    _partial_sessions.discard(session_id)
+
+
+class MessageBuffer:
+    """Coalesces message inserts and session touches into one round trip per flush."""
+
+    def __init__(self):
+        self._pending = []
+        self._session_touches = set()
+        # Flushes run on the background writer and on readers' threads; one at a time.
+        self._lock = threading.Lock()
+
+    def add(self, doc: dict):
+        with self._lock:
+            self._pending.append(doc)
+            self._session_touches.add(doc["session_id"])
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            from pymongo import InsertOne, WriteConcern
+
+            sessions, messages = _get_collections()
+            pending, touches = self._pending, self._session_touches
+            self._pending, self._session_touches = [], set()
+            messages.bulk_write([InsertOne(doc) for doc in pending], ordered=False)
+            # last_active only orders list_sessions, so don't wait for the ack.
+            sessions.with_options(write_concern=WriteConcern(w=0)).update_many(
+                {"_id": {"$in": list(touches)}},
+                {"$currentDate": {"last_active": True}},
+            )
+
+
+_buffer = MessageBuffer()
+_writer = None
+
+
+def _report_write_error(future):
+    err = future.exception()
+    if err is not None:
+        print(f"[db] Failed to save messages: {err}", file=sys.stderr)
+
+
+def _flush_in_background():
+    """Hand the buffered turn to a single writer thread so the caller doesn't wait on MongoDB."""
+    global _writer
+    if _writer is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="openssmide-db")
+    _writer.submit(_buffer.flush).add_done_callback(_report_write_error)
+
+# session_id -> messages in timestamp order, for sessions this process has read or
+# created. Writes from this process are appended, so re-reading a chat is free.
+_message_cache = {}
+# Sessions whose cached list holds only the newest messages (see get_recent_session_messages).
+_partial_sessions = set()
+
+
+def _queue(doc: dict):
+    _buffer.add(doc)
+    cached = _message_cache.get(doc["session_id"])
+    if cached is not None:
+        cached.append(doc)
+
+
+def flush_messages():
+    """Write any buffered messages to MongoDB, waiting for a background write in progress."""
+    _buffer.flush()
+
+
+# The writer thread finishes its queued flushes at shutdown; this catches anything after them.
+atexit.register(flush_messages)
 
 
 def add_message(session_id, role: str, text: str, image_path: str | None = None):
-    messages.insert_one(
+    _queue(
         {
             "session_id": session_id,
             "role": role,
@@ -32,15 +177,77 @@ def add_message(session_id, role: str, text: str, image_path: str | None = None)
             "timestamp": datetime.utcnow(),
         }
     )
-    sessions.update_one(
-        {"_id": session_id},
-        {"$set": {"last_active": datetime.utcnow()}},
-    )
+    _flush_in_background()
+
+
+def add_messages(session_id, turns):
+    """Write several (role, text[, image_path]) messages for one session in a single bulk_write."""
+    timestamp = datetime.utcnow()
+    for offset, (role, text, *image_path) in enumerate(turns):
+        _queue(
+            {
+                "session_id": session_id,
+                "role": role,
+                "text": text,
+                "image_path": image_path[0] if image_path else None,
+                # Keep the turns in order when sorted by timestamp; BSON dates
+                # only hold milliseconds, so smaller offsets would be lost.
+                "timestamp": timestamp + timedelta(milliseconds=offset),
+            }
+        )
+    # One round trip per turn, started now so other terminals see it and a killed
+    # process loses at most the turn in flight, but off the caller's thread.
+    _flush_in_background()
 
 
 def list_sessions(limit: int = 10):
-    return list(sessions.find().sort("last_active", -1).limit(limit))
+    _buffer.flush()
+    sessions, _ = _get_collections()
+    cursor = sessions.find(projection={"title": 1, "last_active": 1})
+    return list(cursor.sort("last_active", -1).limit(limit))
 
 
 def get_session_messages(session_id):
-    return list(messages.find({"session_id": session_id}).sort("timestamp", 1))
+    cached = _message_cache.get(session_id)
+    if cached is not None and session_id not in _partial_sessions:
+        return list(cached)
+    _buffer.flush()
+    _, messages = _get_collections()
+    cursor = messages.find({"session_id": session_id}, projection={"image_path": 0})
+    msgs = list(cursor.sort("timestamp", 1).batch_size(200))
+    _message_cache[session_id] = msgs
+    _partial_sessions.discard(session_id)
+    return list(msgs)
+
+
+def _newest_within(msgs, max_chars: int) -> list:
+    """Takes messages newest-first until their texts total max_chars; returns them oldest-first."""
+    recent = []
+    size = 0
+    for m in msgs:
+        recent.append(m)
+        size += len(m["text"])
+        if size >= max_chars:
+            break
+    recent.reverse()
+    return recent
+
+
+def get_recent_session_messages(session_id, max_chars: int):
+    """
+    Returns the newest messages of a session whose texts add up to at least max_chars.
+
+    Only that tail is read from MongoDB, so resuming a long chat doesn't transfer its whole history.
+    """
+    cached = _message_cache.get(session_id)
+    if cached is not None:
+        return _newest_within(reversed(cached), max_chars)
+    _buffer.flush()
+    _, messages = _get_collections()
+    cursor = messages.find({"session_id": session_id}, projection={"_id": 0, "role": 1, "text": 1})
+    with cursor.sort("timestamp", -1).batch_size(50) as cursor:
+        recent = _newest_within(cursor, max_chars)
+    # Later writes append to this tail, which is all the context builder needs.
+    _message_cache[session_id] = list(recent)
+    _partial_sessions.add(session_id)
+    return recent
@@ -1,25 +1,23 @@
+import functools
 import os
 import re
 import subprocess
+import threading
 import time
 from pathlib import Path
 
-from anthropic import Anthropic
-from openai import OpenAI
 from dotenv import load_dotenv
 
 import base64
 import mimetypes
 
-from .config import load_config
-from .cleanup import cleanup_old_screens
-from .capture_rules import capture_active_window
-from .db import add_message, create_session, get_session_messages
+from .config import PROJECT_ROOT, get_cached_config
+from .cleanup import start_background_cleanup
+from .db import add_messages, create_session, get_recent_session_messages
 
 # --- CONFIG ---
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
-CONFIG = load_config()
-MODEL = CONFIG["model"]
+# Read .env once; the CLI's key-setting commands also update os.environ directly.
+load_dotenv(PROJECT_ROOT / ".env")
 WORK_DIR = Path.home() / ".ss_ai"
 WORK_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -33,13 +31,12 @@ def _provider_from_model(model_id: str) -> str:
 
 
 def _active_provider(cfg=None) -> str:
-    cfg = cfg or load_config()
+    cfg = cfg or get_cached_config()
     return _provider_from_model(cfg.get("model", ""))
 
 
 def require_api_key(provider=None):
     provider = provider or _active_provider()
-    load_dotenv(PROJECT_ROOT / ".env")
     if provider == "anthropic":
         if not os.environ.get("ANTHROPIC_API_KEY"):
             raise SystemExit(
@@ -54,11 +51,34 @@ def require_api_key(provider=None):
             )
 
 
+# httpx drops idle connections after 5s by default, so a follow-up typed a few
+# seconds later pays a fresh TCP+TLS handshake. Keep them around for a chat's pace.
+KEEPALIVE_SECONDS = 60.0
+
+
+# The SDKs already retry 429/5xx responses with jittered exponential backoff that
+# honours Retry-After; allow one more attempt than their default of 2 for bursts.
+MAX_RETRIES = 3
+
+
+def _pool_limits():
+    import httpx
+
+    return httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=KEEPALIVE_SECONDS)
+
+
+def _http_options():
+    """httpx client options: pooled keep-alive, plus HTTP/2 when the optional h2 package is installed."""
+    import importlib.util
+
+    # HTTP/2 lets parallel requests (split_questions, ask_many) share one connection.
+    return {"limits": _pool_limits(), "http2": importlib.util.find_spec("h2") is not None}
+
+
 def get_client(provider=None):
     """Lazy-init the selected provider client. Only called when needed."""
     provider = provider or _active_provider()
     global _openai_client, _anthropic_client
-    load_dotenv(PROJECT_ROOT / ".env")
 
     if provider == "anthropic":
         if _anthropic_client is None:
@@ -68,7 +88,13 @@ def get_client(provider=None):
                     "\n  ✗ ANTHROPIC_API_KEY not set.\n"
                     "  Run: openssmide setup\n"
                 )
-            _anthropic_client = Anthropic(api_key=api_key)
+            from anthropic import Anthropic, DefaultHttpxClient
+
+            _anthropic_client = Anthropic(
+                api_key=api_key,
+                http_client=DefaultHttpxClient(**_http_options()),
+                max_retries=MAX_RETRIES,
+            )
         return _anthropic_client
 
     if _openai_client is None:
@@ -78,24 +104,101 @@ def get_client(provider=None):
                 "\n  ✗ OPENAI_API_KEY not set.\n"
                 "  Run: openssmide setup\n"
             )
-        _openai_client = OpenAI(api_key=api_key)
+        from openai import DefaultHttpxClient, OpenAI
+
+        _openai_client = OpenAI(
+            api_key=api_key,
+            http_client=DefaultHttpxClient(**_http_options()),
+            max_retries=MAX_RETRIES,
+        )
     return _openai_client
 
 
-def _ask_model(prompt: str, model_id: str, image_path: Path = None) -> str:
+def _thumbnail(path_str: str, max_edge: int):
+    """
+    Returns a CGImage of the file shrunk so its long edge is at most max_edge,
+    or None if it is already small enough (or can't be read).
+    """
+    import Quartz
+    from Foundation import NSURL
+
+    src = Quartz.CGImageSourceCreateWithURL(NSURL.fileURLWithPath_(path_str), None)
+    if src is None:
+        return None
+    props = Quartz.CGImageSourceCopyPropertiesAtIndex(src, 0, None) or {}
+    width = props.get(Quartz.kCGImagePropertyPixelWidth, 0)
+    height = props.get(Quartz.kCGImagePropertyPixelHeight, 0)
+    if max(width, height) <= max_edge:
+        return None
+
+    return Quartz.CGImageSourceCreateThumbnailAtIndex(src, 0, {
+        Quartz.kCGImageSourceCreateThumbnailFromImageAlways: True,
+        Quartz.kCGImageSourceCreateThumbnailWithTransform: True,
+        Quartz.kCGImageSourceThumbnailMaxPixelSize: max_edge,
+    })
+
+
+@functools.lru_cache(maxsize=2)
+def _downscaled_png(path_str: str, mtime_ns: int, max_edge: int):
+    """
+    Returns PNG bytes of the image shrunk so its long edge is at most max_edge,
+    or None if it is already small enough (or can't be read).
+
+    Retina captures are far larger than the providers' working resolution, so
+    shrinking first cuts upload size without losing detail the model would see.
+    mtime_ns only keys the cache.
+    """
+    import Quartz
+    from Foundation import NSMutableData
+
+    thumb = _thumbnail(path_str, max_edge)
+    if thumb is None:
+        return None
+    out = NSMutableData.data()
+    dest = Quartz.CGImageDestinationCreateWithData(out, "public.png", 1, None)
+    if dest is None:
+        return None
+    Quartz.CGImageDestinationAddImage(dest, thumb, None)
+    if not Quartz.CGImageDestinationFinalize(dest):
+        return None
+    return bytes(out)
+
+
+def _build_request(prompt: str, model_id: str, image_path: Path = None, cache_key: str = None):
+    """
+    Returns (provider, create() kwargs) for a single-turn request.
+
+    cache_key routes requests sharing a prompt prefix (e.g. one chat session) to the
+    same OpenAI prompt cache; Anthropic ignores it.
+    """
     provider = _provider_from_model(model_id)
-    
+
     # 1. Prepare base64 image if provided
     base64_image = None
     media_type = None
     if image_path and image_path.exists():
-        with open(image_path, "rb") as image_file:
-            base64_image = base64.b64encode(image_file.read()).decode("utf-8")
-        media_type = mimetypes.guess_type(image_path)[0] or "image/png"
+        cfg = get_cached_config()
+        data = None
+        if cfg.get("downscale_for_llm", True):
+            data = _downscaled_png(
+                str(image_path),
+                image_path.stat().st_mtime_ns,
+                int(cfg.get("llm_image_max_edge", 1568)),
+            )
+        if data is not None:
+            media_type = "image/png"
+        else:
+            data = image_path.read_bytes()
+            # Captures are always PNG; only consult mimetypes for other files.
+            if image_path.suffix.lower() == ".png":
+                media_type = "image/png"
+            else:
+                media_type = mimetypes.guess_type(image_path)[0] or "image/png"
+        base64_image = base64.b64encode(data).decode("ascii")
 
+    content = [{"type": "text", "text": prompt}]
     if provider == "anthropic":
         # Build Anthropic content block
-        content = [{"type": "text", "text": prompt}]
         if base64_image:
             content.insert(0, {
                 "type": "image",
@@ -105,21 +208,13 @@ def _ask_model(prompt: str, model_id: str, image_path: Path = None) -> str:
                     "data": base64_image,
                 },
             })
-            
-        resp = get_client("anthropic").messages.create(
-            model=model_id,
-            max_tokens=1600,
-            messages=[{"role": "user", "content": content}],
-        )
-        blocks = []
-        for part in resp.content or []:
-            text = getattr(part, "text", None)
-            if text:
-                blocks.append(text)
-        return "\n".join(blocks).strip()
+        return provider, {
+            "model": model_id,
+            "max_tokens": 1600,
+            "messages": [{"role": "user", "content": content}],
+        }
 
     # Build OpenAI content block
-    content = [{"type": "text", "text": prompt}]
     if base64_image:
         content.insert(0, {
             "type": "image_url",
@@ -127,28 +222,104 @@ def _ask_model(prompt: str, model_id: str, image_path: Path = None) -> str:
                 "url": f"data:{media_type};base64,{base64_image}"
             }
         })
-        
-    resp = get_client("openai").chat.completions.create(
-        model=model_id,
-        messages=[{"role": "user", "content": content}],
-    )
+    kwargs = {
+        "model": model_id,
+        "messages": [{"role": "user", "content": content}],
+    }
+    if cache_key:
+        # Sent as a raw body field so older SDK versions without the parameter still work.
+        kwargs["extra_body"] = {"prompt_cache_key": cache_key}
+    return provider, kwargs
+
+
+def _response_text(provider: str, resp) -> str:
+    if provider == "anthropic":
+        blocks = []
+        for part in resp.content or []:
+            text = getattr(part, "text", None)
+            if text:
+                blocks.append(text)
+        return "\n".join(blocks).strip()
     return resp.choices[0].message.content.strip()
 
 
+def _ask_model_stream(provider: str, kwargs: dict, on_token) -> str:
+    """Streams the completion, passing each text delta to on_token; returns the full text."""
+    client = get_client(provider)
+    parts = []
+    if provider == "anthropic":
+        with client.messages.stream(**kwargs) as stream:
+            for delta in stream.text_stream:
+                parts.append(delta)
+                on_token(delta)
+    else:
+        for chunk in client.chat.completions.create(**kwargs, stream=True):
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                on_token(delta)
+    return "".join(parts).strip()
+
+
+def _ask_model(prompt: str, model_id: str, image_path: Path = None, on_token=None, cache_key: str = None) -> str:
+    provider, kwargs = _build_request(prompt, model_id, image_path, cache_key)
+    if on_token is not None:
+        return _ask_model_stream(provider, kwargs, on_token)
+    client = get_client(provider)
+    if provider == "anthropic":
+        resp = client.messages.create(**kwargs)
+    else:
+        resp = client.chat.completions.create(**kwargs)
+    return _response_text(provider, resp)
+
+
 def ask_prompt(prompt: str, model_id: str = None) -> str:
-    cfg = load_config()
+    cfg = get_cached_config()
     return _ask_model(prompt, model_id or cfg["model"])
 
-cleanup_old_screens()
+start_background_cleanup()
 
 # -------- OCR (macOS Vision) --------
-from Foundation import NSURL
-from Vision import (
-    VNRecognizeTextRequest,
-    VNImageRequestHandler,
-    VNRequestTextRecognitionLevelAccurate,
-    VNRequestTextRecognitionLevelFast,
-)
+# Vision and the capture code are imported on first use so text-only commands
+# (ask, voice, chat) don't load the PyObjC frameworks.
+
+
+# Text requests by (accurate, languages), kept for the process so Vision's model stays
+# loaded between captures, whichever thread runs them. One request object must not
+# recognise two images at once, so their use is serialised by _ocr_lock.
+_ocr_requests = {}
+_ocr_lock = threading.Lock()
+
+
+def _ocr_request(accurate: bool, langs):
+    """Returns the shared configured text request; call with _ocr_lock held."""
+    key = (accurate, tuple(langs or ()))
+    req = _ocr_requests.get(key)
+    if req is None:
+        from Vision import (
+            VNRecognizeTextRequest,
+            VNRequestTextRecognitionLevelAccurate,
+            VNRequestTextRecognitionLevelFast,
+        )
+
+        req = VNRecognizeTextRequest.alloc().init()
+        req.setRecognitionLevel_(VNRequestTextRecognitionLevelAccurate if accurate else VNRequestTextRecognitionLevelFast)
+        req.setUsesLanguageCorrection_(True)
+        if langs:
+            req.setRecognitionLanguages_(langs)
+        _ocr_requests[key] = req
+    return req
+
+
+def _recognized_lines(req) -> list:
+    lines = []
+    for obs in req.results() or []:
+        cand = obs.topCandidates_(1)
+        if cand:
+            lines.append(str(cand[0].string()))
+    return lines
 
 
 def ocr_image(path: Path) -> str:
@@ -163,34 +334,44 @@ def ocr_image(path: Path) -> str:
     Returns:
         str: The text extracted from the image.
     """
-    lines = []
-
-    def handler(req, err):
-        if err and CONFIG["debug_ocr"]:
-            print("[OCR ERROR]", err)
-        if err:
-            return
-        for obs in req.results() or []:
-            cand = obs.topCandidates_(1)
-            if cand:
-                lines.append(str(cand[0].string()))
-
-    req = VNRecognizeTextRequest.alloc().initWithCompletionHandler_(handler)
-    level = CONFIG.get("ocr_recognition_level", "accurate")
-    if level == "fast":
-        req.setRecognitionLevel_(VNRequestTextRecognitionLevelFast)
+    cfg = get_cached_config()
+    level = cfg.get("ocr_recognition_level", "accurate")
+    langs = cfg.get("ocr_languages")
+    max_edge = int(cfg.get("ocr_max_edge", 1600)) if cfg.get("ocr_downscale", True) else 0
+    # Identical screenshots (retries, unchanged screens) reuse the earlier result.
+    cache_name = "ocr_" + _cache_key(path, level, ",".join(langs or ()), str(max_edge))
+    cached = _read_cache(cache_name)
+    if isinstance(cached, str):
+        return cached
+
+    from Foundation import NSURL
+    from Vision import VNImageRequestHandler
+
+    fast = level == "fast"
+
+    # Recognition time grows with pixel count; Retina captures OCR just as well at half size.
+    small = _thumbnail(str(path), max_edge) if max_edge else None
+    if small is not None:
+        h = VNImageRequestHandler.alloc().initWithCGImage_options_(small, None)
     else:
-        req.setRecognitionLevel_(VNRequestTextRecognitionLevelAccurate)
-    req.setUsesLanguageCorrection_(True)
-    langs = CONFIG.get("ocr_languages")
-    if langs:
-        req.setRecognitionLanguages_(langs)
-
-    url = NSURL.fileURLWithPath_(str(path))
-    h = VNImageRequestHandler.alloc().initWithURL_options_(url, None)
-    h.performRequests_error_([req], None)
-
-    return "\n".join(lines)
+        url = NSURL.fileURLWithPath_(str(path))
+        h = VNImageRequestHandler.alloc().initWithURL_options_(url, None)
+    with _ocr_lock:
+        req = _ocr_request(not fast, langs)
+        ok, err = h.performRequests_error_([req], None)
+        lines = _recognized_lines(req) if ok else []
+        if fast and ok and not lines and cfg.get("ocr_accurate_fallback", True):
+            # Fast mode can miss small or stylised text entirely; retry once on the same handler.
+            req = _ocr_request(True, langs)
+            ok, err = h.performRequests_error_([req], None)
+            lines = _recognized_lines(req) if ok else []
+    if not ok and cfg["debug_ocr"]:
+        print("[OCR ERROR]", err)
+
+    text = "\n".join(lines)
+    if ok:
+        _write_cache(cache_name, text)
+    return text
 
 
 # -------- OpenAI ask --------
@@ -205,42 +386,104 @@ def ask_gpt(text: str, image_path: Path = None) -> str:
     Returns:
         str: The AI's response.
     """
-    cfg = load_config()
+    cfg = get_cached_config()
     
     # We include both the OCR extracted text and the image itself giving the AI maximum context
     prompt = cfg["prompt_main"].format(text=text)
     return _ask_model(prompt, cfg["model"], image_path=image_path)
 
 
-def ask_followup(context: str, question: str) -> str:
+def session_cache_key(session_id):
+    """Prompt-cache routing key for a chat session (None when there is no session)."""
+    return f"session:{session_id}" if session_id else None
+
+
+def ask_many(prompts, model_id: str = None, image_path: Path = None) -> list:
+    """
+    Sends independent prompts concurrently and returns the answers in the same order.
+
+    Args:
+        prompts (list[str]): The prompts to send.
+        model_id (str, optional): Model to use. Defaults to the configured model.
+        image_path (Path, optional): Screenshot attached to every prompt.
+
+    Returns:
+        list[str]: One answer per prompt.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    model_id = model_id or get_cached_config()["model"]
+    if len(prompts) <= 1:
+        return [_ask_model(p, model_id, image_path=image_path) for p in prompts]
+    # The SDK clients are thread-safe and share one connection pool.
+    with ThreadPoolExecutor(max_workers=min(len(prompts), 8)) as pool:
+        return list(pool.map(lambda p: _ask_model(p, model_id, image_path=image_path), prompts))
+
+
+_NUMBERED_QUESTION_RE = re.compile(r"^[ \t]*(?:Q(?:uestion)?[ \t]*)?\d{1,3}[.)][ \t]", re.MULTILINE | re.IGNORECASE)
+
+
+def split_numbered_questions(text: str) -> list:
+    """
+    Splits OCR text into numbered questions ("1.", "2)", "Q3." ...).
+
+    Any text before the first question is kept as a shared preamble on each part.
+    Returns an empty list when fewer than two questions are found.
+    """
+    starts = [m.start() for m in _NUMBERED_QUESTION_RE.finditer(text)]
+    if len(starts) < 2:
+        return []
+    preamble = text[:starts[0]].strip()
+    bounds = starts + [len(text)]
+    parts = [text[a:b].strip() for a, b in zip(bounds, bounds[1:])]
+    return [f"{preamble}\n\n{part}" if preamble else part for part in parts]
+
+
+def ask_questions(text: str, image_path: Path = None) -> str:
+    """
+    Like ask_gpt(), but answers each numbered question in the OCR text with its own
+    concurrent request when split_questions is enabled, joining the answers in order.
+    """
+    cfg = get_cached_config()
+    questions = split_numbered_questions(text) if cfg.get("split_questions", False) else []
+    if not questions:
+        return ask_gpt(text, image_path=image_path)
+    prompts = [cfg["prompt_main"].format(text=q) for q in questions]
+    return "\n\n".join(ask_many(prompts, cfg["model"], image_path=image_path))
+
+
+def ask_followup(context: str, question: str, on_token=None, session_id=None) -> str:
     """
     Sends a follow-up question to the AI, maintaining conversation context.
 
     Args:
         context (str): The previous conversation context (messages).
         question (str): The user's new question.
+        on_token (callable, optional): If given, the response is streamed and each text chunk is passed to it.
+        session_id (ObjectId, optional): The chat session, used to keep its turns on one prompt cache.
 
     Returns:
         str: The AI's response to the follow-up question.
     """
-    cfg = load_config()
+    cfg = get_cached_config()
     prompt = cfg["prompt_followup"].format(context=context, question=question)
-    return _ask_model(prompt, cfg["model"])
+    return _ask_model(prompt, cfg["model"], on_token=on_token, cache_key=session_cache_key(session_id))
 
 
-def general_ask(question: str) -> str:
+def general_ask(question: str, on_token=None) -> str:
     """
     Asks the AI a general question without screenshot context.
 
     Args:
         question (str): The question to ask.
+        on_token (callable, optional): If given, the response is streamed and each text chunk is passed to it.
 
     Returns:
         str: The AI's response.
     """
-    cfg = load_config()
+    cfg = get_cached_config()
     prompt = cfg["prompt_general"].format(question=question)
-    return _ask_model(prompt, cfg["model"])
+    return _ask_model(prompt, cfg["model"], on_token=on_token)
 
 
 # -------- Screenshot --------
@@ -258,12 +501,18 @@ def take_ss(out: Path, target=None, full_slide=False):
     Raises:
         RuntimeError: If capturing the window fails.
     """
-    capture_target = (target or CONFIG.get("capture_target", "chrome")).lower()
+    from .capture_rules import capture_active_window
+
+    capture_target = (target or get_cached_config().get("capture_target", "chrome")).lower()
     ok, err = capture_active_window(out, target=capture_target, full_slide=full_slide)
     if not ok:
         raise RuntimeError(err or f"Failed to capture {capture_target} window.")
 
 
+# The closing fence may or may not sit on its own line.
+_CODE_BLOCK_RE = re.compile(r"```(?:\w+)?\n(.*?)\n?```", re.DOTALL)
+
+
 def extract_first_code_block(text: str) -> str:
     """
     Extracts the content of the first markdown code block from a text string.
@@ -274,24 +523,38 @@ def extract_first_code_block(text: str) -> str:
     Returns:
         str: The extracted code block content, or an empty string if none are found.
     """
+    # Most answers have no fence; a substring check is far cheaper than the DOTALL scan.
+    if "```" not in text:
+        return ""
     # Look for code blocks with any language or no language specifier
-    matches = re.findall(r"```(?:\w+)?\n(.*?)\n```", text, re.DOTALL)
-    if not matches:
-        # Fallback for blocks that might not have a trailing newline before the closing backticks
-        matches = re.findall(r"```(?:\w+)?\n(.*?)```", text, re.DOTALL)
-    return matches[0].strip() if matches else ""
+    match = _CODE_BLOCK_RE.search(text)
+    return match.group(1).strip() if match else ""
 
 
 def copy_to_clipboard(text: str):
     """
-    Copies the given text to the macOS clipboard using the `pbcopy` utility.
+    Copies the given text to the macOS clipboard via NSPasteboard, falling back to `pbcopy`.
 
     Args:
         text (str): The text to copy.
     """
     if not text:
         return
-    subprocess.run(["pbcopy"], input=text.encode("utf-8"), check=True)
+    try:
+        from AppKit import NSPasteboard, NSPasteboardTypeString
+    except ImportError:
+        subprocess.run(["pbcopy"], input=text.encode("utf-8"), check=True)
+        return
+    # Write the pasteboard in-process instead of spawning pbcopy for every copy.
+    pb = NSPasteboard.generalPasteboard()
+    pb.clearContents()
+    pb.setString_forType_(text, NSPasteboardTypeString)
+
+
+_ROLE_PREFIX = {"user": "User: ", "assistant": "Assistant: "}
+
+# session_id -> (newest message, max_chars, context) from the last build_context call.
+_context_cache = {}
 
 
 def build_context(session_id) -> str:
@@ -306,19 +569,171 @@ def build_context(session_id) -> str:
     Returns:
         str: The formatted conversation context.
     """
-    msgs = get_session_messages(session_id)
+    max_chars = get_cached_config().get("max_context_chars", 8000)
+    msgs = get_recent_session_messages(session_id, max_chars)
+    last, cached_max, ctx = _context_cache.get(session_id, (None, max_chars, ""))
+    # Messages are append-only, so only format the turns added since the last call.
+    start = 0
+    if last is not None and cached_max == max_chars:
+        for i in range(len(msgs) - 1, -1, -1):
+            if msgs[i] is last:
+                start = i + 1
+                break
+    if not start:
+        ctx = ""
+    elif start == len(msgs):
+        return ctx
+    new_msgs = msgs[start:]
+    # Walk back from the newest message and stop once the budget is covered,
+    # so long chats don't format turns that would be truncated away.
     lines = []
-    for m in msgs:
-        role = "User" if m["role"] == "user" else "Assistant"
-        lines.append(f"{role}: {m['text']}")
+    size = 0
+    for m in reversed(new_msgs):
+        line = _ROLE_PREFIX.get(m["role"], "Assistant: ") + m["text"]
+        lines.append(line)
+        size += len(line) + 1
+        if size > max_chars:
+            break
+    else:
+        if ctx:
+            lines.append(ctx)
+    lines.reverse()
     ctx = "\n".join(lines)
-    max_chars = CONFIG.get("max_context_chars", 8000)
     if len(ctx) > max_chars:
         ctx = ctx[-max_chars:]
+    _context_cache[session_id] = (msgs[-1] if msgs else None, max_chars, ctx)
     return ctx
 
 
+# -------- Capture cache --------
+CACHE_DIR = WORK_DIR / "cache"
+
+
+@functools.lru_cache(maxsize=4)
+def _image_digest(path_str: str, mtime_ns: int) -> bytes:
+    # mtime_ns only keys the cache; the OCR and capture caches both hash the same file.
+    import hashlib
+
+    return hashlib.blake2b(Path(path_str).read_bytes(), digest_size=16).digest()
+
+
+def _cache_key(img: Path, *parts: str) -> str:
+    import hashlib
+
+    h = hashlib.blake2b(_image_digest(str(img), img.stat().st_mtime_ns), digest_size=16)
+    for part in parts:
+        h.update(b"\0" + part.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _read_cache(name: str):
+    from .config import json_loads
+
+    try:
+        return json_loads((CACHE_DIR / f"{name}.json").read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(name: str, value):
+    from .config import json_dumps
+
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        (CACHE_DIR / f"{name}.json").write_bytes(json_dumps(value))
+    except OSError:
+        pass
+
+
+def _answer_settings():
+    cfg = get_cached_config()
+    return (
+        cfg["model"],
+        cfg["prompt_main"],
+        str(cfg.get("ocr_in_prompt", True)),
+        str(cfg.get("split_questions", False)),
+        str(cfg.get("downscale_for_llm", True)),
+        str(cfg.get("llm_image_max_edge", 1568)),
+    )
+
+
+def _capture_cache_key(img: Path) -> str:
+    """Hash of the screenshot plus every setting that shapes the answer (see _answer_settings)."""
+    return _cache_key(img, *_answer_settings())
+
+
+def _dhash(img: Path):
+    """
+    64-bit difference hash of the screenshot (9x8 grayscale thumbnail, one bit per
+    horizontal neighbour pair), or None if the image can't be read.
+    """
+    import Quartz
+    from Foundation import NSURL
+
+    src = Quartz.CGImageSourceCreateWithURL(NSURL.fileURLWithPath_(str(img)), None)
+    image = Quartz.CGImageSourceCreateImageAtIndex(src, 0, None) if src is not None else None
+    if image is None:
+        return None
+    pixels = bytearray(9 * 8)
+    ctx = Quartz.CGBitmapContextCreate(
+        pixels, 9, 8, 8, 9, Quartz.CGColorSpaceCreateDeviceGray(), Quartz.kCGImageAlphaNone
+    )
+    if ctx is None:
+        return None
+    Quartz.CGContextSetInterpolationQuality(ctx, Quartz.kCGInterpolationMedium)
+    Quartz.CGContextDrawImage(ctx, Quartz.CGRectMake(0, 0, 9, 8), image)
+    bits = 0
+    for row in range(0, 72, 9):
+        for col in range(row, row + 8):
+            bits = (bits << 1) | (pixels[col] > pixels[col + 1])
+    return bits
+
+
+def _similar_capture(img: Path):
+    """
+    Returns (dhash, cached (text, ans) or None). The cached answer is the previous
+    capture's when the screen looks the same (dHash within similar_capture_distance)
+    and the model and prompts haven't changed.
+    """
+    dhash = _dhash(img)
+    last = _read_cache("last_capture")
+    if dhash is None or not isinstance(last, dict):
+        return dhash, None
+    if last.get("settings") != list(_answer_settings()):
+        return dhash, None
+    distance = bin(dhash ^ last.get("dhash", 0)).count("1")
+    if distance > int(get_cached_config().get("similar_capture_distance", 4)):
+        return dhash, None
+    return dhash, (last["ocr_text"], last["ai_response"])
+
+
+def _remember_last_capture(dhash, text: str, ans: str):
+    if dhash is not None:
+        _write_cache("last_capture", {
+            "dhash": dhash,
+            "settings": list(_answer_settings()),
+            "ocr_text": text,
+            "ai_response": ans,
+        })
+
+
+def _load_cached_capture(key: str):
+    data = _read_cache(key)
+    try:
+        return data["ocr_text"], data["ai_response"]
+    except (TypeError, KeyError):
+        return None
+
+
+def _store_cached_capture(key: str, text: str, ans: str):
+    _write_cache(key, {"ocr_text": text, "ai_response": ans})
+
+
 # -------- Main --------
+_NO_OCR_TEXT = "(No text detected via macOS OCR, but the image will still be processed visually by the Language Model)"
+_IMAGE_ONLY_TEXT = "(Read the text directly from the attached screenshot.)"
+
+
 def take_screenshot_and_analyze(session_title=None, target=None, full_slide=False):
     """
     Main workflow to capture a screenshot, run OCR, save to a database session, and ask the AI.
@@ -333,28 +748,109 @@ def take_screenshot_and_analyze(session_title=None, target=None, full_slide=Fals
     """
     require_api_key()
 
-    img = WORK_DIR / f"ss_{int(time.time())}.png"
+    day_dir = WORK_DIR / time.strftime("%Y-%m-%d")
+    day_dir.mkdir(exist_ok=True)
+    img = day_dir / f"ss_{int(time.time())}.png"
     try:
         take_ss(img, target=target, full_slide=full_slide)
     except Exception as e:
         return None, str(e)
 
-    text = ocr_image(img)
-
-    if not text.strip():
-        text = "(No text detected via macOS OCR, but the image will still be processed visually by the Language Model)"
+    from concurrent.futures import ThreadPoolExecutor
 
     title = session_title or time.strftime("Screenshot session %Y-%m-%d %H:%M:%S")
-    session_id = create_session(title)
-    add_message(session_id, "user", text, str(img))
-
-    # We now pass the exact screenshot image for multimodal reasoning alongside the backup OCR text.
-    ans = ask_gpt(text, image_path=img)
-    add_message(session_id, "assistant", ans)
+    cfg = get_cached_config()
+    cache_key = _capture_cache_key(img)
+    # Turn off to get a fresh answer when re-capturing an unchanged screen.
+    cached = _load_cached_capture(cache_key) if cfg.get("reuse_cached_answers", True) else None
+    reuse_similar = cfg.get("reuse_similar_capture", False)
+    dhash = None
+    if cached is None and reuse_similar:
+        # Near-identical screen (cursor blink, clock tick) to the last capture.
+        dhash, cached = _similar_capture(img)
+    if cached is not None:
+        # Same screen, model and prompt as an earlier capture: reuse its OCR text and answer.
+        text, ans = cached
+        session_id = create_session(title)
+        add_messages(session_id, [("user", text, str(img)), ("assistant", ans)])
+        return session_id, (text, ans, img)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        # OCR and the session insert don't depend on each other; run them together.
+        ocr_future = pool.submit(ocr_image, img)
+        session_future = pool.submit(create_session, title)
+
+        if get_cached_config().get("ocr_in_prompt", True):
+            text = ocr_future.result()
+            if text.strip():
+                # We now pass the exact screenshot image for multimodal reasoning alongside the backup OCR text.
+                ans = ask_questions(text, image_path=img)
+            else:
+                # Nothing to add to the image; send the short image-only prompt.
+                ans = ask_gpt(_IMAGE_ONLY_TEXT, image_path=img)
+                text = _NO_OCR_TEXT
+        else:
+            # Image-only request: OCR finishes in the background while the model answers.
+            ans = ask_gpt(_IMAGE_ONLY_TEXT, image_path=img)
+            text = ocr_future.result()
+            if not text.strip():
+                text = _NO_OCR_TEXT
+        session_id = session_future.result()
+
+    _store_cached_capture(cache_key, text, ans)
+    if reuse_similar:
+        _remember_last_capture(dhash, text, ans)
+    add_messages(session_id, [("user", text, str(img)), ("assistant", ans)])
     
     return session_id, (text, ans, img)
 
 
+_console = None
+
+
+def _default_console():
+    """One shared Console for callers that don't pass their own."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+class _StreamingAnswer:
+    """Live renderable that shows a streamed answer as it arrives."""
+
+    def __init__(self):
+        self.parts = []
+
+    def add(self, token: str):
+        self.parts.append(token)
+
+    def __rich__(self):
+        from rich.markdown import Markdown
+        from rich.text import Text
+
+        if not self.parts:
+            return Text("Thinking...", style="dim")
+        return Markdown("".join(self.parts))
+
+
+def stream_answer(ask_fn, *args, console=None, **kwargs):
+    """
+    Calls ask_fn(*args, on_token=..., **kwargs) while rendering tokens live.
+
+    The live view is transient; pass the returned answer to handle_ai_response()
+    for the final panel and autocopy.
+    """
+    from rich.live import Live
+
+    console = console or _default_console()
+    view = _StreamingAnswer()
+    with Live(view, console=console, transient=True, refresh_per_second=8):
+        return ask_fn(*args, on_token=view.add, **kwargs)
+
+
 def handle_ai_response(ans: str, console=None):
     """
     Unified handler for organizing AI responses. Prints to the terminal as Markdown and manages code auto-copying.
@@ -363,29 +859,24 @@ def handle_ai_response(ans: str, console=None):
         ans (str): The response string from the AI.
         console (rich.console.Console, optional): Configured Rich console instance. Defaults to None.
     """
-    from rich.console import Console
-    from rich.panel import Panel
     from rich.markdown import Markdown
-    from .ss_ai import extract_first_code_block, copy_to_clipboard
-    from .config import load_config
+    from rich.panel import Panel
 
-    if console is None:
-        console = Console()
-        
-    cfg = load_config()
+    console = console or _default_console()
+    cfg = get_cached_config()
 
     # 1. Print Main Answer
     console.print(Panel(Markdown(ans), title="AI Analysis", border_style="green"))
 
     # 2. Handle Autocopy
     if cfg.get("autocopy", False):
-        mode = cfg.get("autocopy_mode", "answer")
-        code_block = extract_first_code_block(ans)
-        payload = code_block if (mode == "code" and code_block) else ans
-        
+        # Only scan for a code block when it would actually be copied.
+        code_block = extract_first_code_block(ans) if cfg.get("autocopy_mode", "answer") == "code" else ""
+        payload = code_block or ans
+
         if payload:
             copy_to_clipboard(payload)
-            msg = "Code copied" if mode == "code" and code_block else "Answer copied"
+            msg = "Code copied" if code_block else "Answer copied"
             console.print(f"[dim italic]({msg} to clipboard)[/dim italic]")
 
 
@@ -412,11 +903,10 @@ def main():
         if not q:
             break
         ctx = build_context(session_id)
-        follow_ans = ask_followup(ctx, q)
+        follow_ans = ask_followup(ctx, q, session_id=session_id)
         print("\n[AI FOLLOW-UP]\n")
         print(follow_ans)
-        add_message(session_id, "user", q)
-        add_message(session_id, "assistant", follow_ans)
+        add_messages(session_id, [("user", q), ("assistant", follow_ans)])
 
 
 if __name__ == "__main__":
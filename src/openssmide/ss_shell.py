@@ -1,15 +1,13 @@
 import os
-from pathlib import Path
+import sys
 
-from bson import ObjectId
 from dotenv import load_dotenv
 
-from .config import load_config
-from .db import add_message, get_session_messages, list_sessions
+from .config import PROJECT_ROOT, get_cached_config, load_config
+from .db import add_messages, get_recent_session_messages, list_sessions
 from .ss_ai import get_client
 
 
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
 load_dotenv(PROJECT_ROOT / ".env")
 CONFIG = load_config()
 MODEL = os.getenv("SS_MODEL", CONFIG["model"])
@@ -17,11 +15,26 @@ MODEL = os.getenv("SS_MODEL", CONFIG["model"])
 current_session = None
 
 
-def ask_llm(context: str, question: str) -> str:
-    cfg = load_config()
+def ask_llm(context: str, question: str, session_id=None, on_token=None) -> str:
+    from .ss_ai import session_cache_key
+
+    cfg = get_cached_config()
     prompt = cfg["prompt_followup"].format(context=context, question=question)
-    r = get_client().responses.create(model=cfg.get("model", "gpt-4o-mini"), input=prompt)
-    return r.output_text.strip()
+    kwargs = {"model": cfg.get("model", "gpt-4o-mini"), "input": prompt}
+    cache_key = session_cache_key(session_id)
+    if cache_key:
+        kwargs["extra_body"] = {"prompt_cache_key": cache_key}
+    if on_token is None:
+        r = get_client().responses.create(**kwargs)
+        return r.output_text.strip()
+
+    parts = []
+    with get_client().responses.stream(**kwargs) as stream:
+        for event in stream:
+            if event.type == "response.output_text.delta":
+                parts.append(event.delta)
+                on_token(event.delta)
+    return "".join(parts).strip()
 
 
 def print_sessions():
@@ -31,16 +44,9 @@ def print_sessions():
 
 
 def load_context(session_id) -> str:
-    msgs = get_session_messages(session_id)
-    ctx_lines = []
-    for m in msgs:
-        role = "User" if m["role"] == "user" else "Assistant"
-        ctx_lines.append(f"{role}: {m['text']}")
-    ctx = "\n".join(ctx_lines)
-    max_chars = CONFIG.get("max_context_chars", 8000)
-    if len(ctx) > max_chars:
-        ctx = ctx[-max_chars:]
-    return ctx
+    from .ss_ai import build_context
+
+    return build_context(session_id)
 
 
 def open_latest_session():
@@ -50,16 +56,45 @@ def open_latest_session():
     return sessions[0]["_id"]
 
 
+def _warm_up(session_id):
+    """
+    Starts background work that would otherwise sit on the first turn's critical path:
+    loading the session history into the db cache and opening the API connection.
+
+    Returns the history thread; join it before reading the context.
+    """
+    import threading
+
+    def load_history():
+        try:
+            get_recent_session_messages(session_id, get_cached_config().get("max_context_chars", 8000))
+        except Exception:
+            pass
+
+    def open_connection():
+        # A models listing costs no tokens but completes DNS, TCP and TLS setup.
+        try:
+            get_client().with_options(max_retries=0, timeout=5).models.list()
+        except (Exception, SystemExit):
+            pass
+
+    history = threading.Thread(target=load_history, daemon=True)
+    history.start()
+    threading.Thread(target=open_connection, daemon=True).start()
+    return history
+
+
 def interactive_chat(session_id):
     import readline  # enables arrow keys, cursor movement, history
     from rich.console import Console
     from rich.prompt import Prompt
-    from .ss_ai import handle_ai_response, take_screenshot_and_analyze, build_context, ask_followup
-    from .config import AVAILABLE_MODELS, save_config
+    from .ss_ai import handle_ai_response, take_screenshot_and_analyze, build_context, ask_followup, stream_answer
+    from .config import AVAILABLE_MODELS, MODEL_CHOICES, save_config
     import sys
 
     console = Console()
     current_session = session_id
+    warm_up = _warm_up(session_id)
 
     console.print("\n[bold green]Chat session active.[/bold green]")
     console.print("[dim]Type /help for commands. Arrow keys work. Type 'capture' to re-capture.[/dim]\n")
@@ -81,7 +116,6 @@ def interactive_chat(session_id):
         if cmd in ("capture", "/capture"):
             console.print()
             with console.status("[bold blue]Capturing and analyzing..."):
-                from .ss_ai import take_screenshot_and_analyze
                 s_id, result = take_screenshot_and_analyze(None)
             if not s_id:
                 console.print(f"[red]{result}[/red]")
@@ -124,7 +158,7 @@ def interactive_chat(session_id):
             for i, m in enumerate(AVAILABLE_MODELS, 1):
                 table.add_row(str(i), m["id"], m["desc"])
             console.print(table)
-            choice = Prompt.ask("Select model number", choices=[str(i) for i in range(1, len(AVAILABLE_MODELS)+1)])
+            choice = Prompt.ask("Select model number", choices=MODEL_CHOICES)
             selected = AVAILABLE_MODELS[int(choice)-1]
             cfg = load_config()
             cfg["model"] = selected["id"]
@@ -142,13 +176,13 @@ def interactive_chat(session_id):
             continue
 
         with console.status("[dim]Thinking...[/dim]"):
+            warm_up.join()
             ctx = load_context(current_session)
-            ans = ask_llm(ctx, q)
+        ans = stream_answer(ask_llm, ctx, q, session_id=current_session, console=console)
 
         handle_ai_response(ans, console)
 
-        add_message(current_session, "user", q)
-        add_message(current_session, "assistant", ans)
+        add_messages(current_session, [("user", q), ("assistant", ans)])
         console.print("")  # Padding
 
 
@@ -180,6 +214,8 @@ def main():
             continue
 
         if cmd.startswith("/open "):
+            from bson import ObjectId
+
             sid = cmd.split(" ", 1)[1].strip()
             current_session = ObjectId(sid)
             print("Opened session", sid)
@@ -192,11 +228,10 @@ def main():
 
             q = cmd.split(" ", 1)[1].strip()
             ctx = load_context(current_session)
-            ans = ask_llm(ctx, q)
+            ans = ask_llm(ctx, q, session_id=current_session)
 
             print("\n", ans, "\n")
-            add_message(current_session, "user", q)
-            add_message(current_session, "assistant", ans)
+            add_messages(current_session, [("user", q), ("assistant", ans)])
             continue
 
         if cmd == "/follow":
@@ -221,7 +256,9 @@ def main():
             continue
 
         if cmd == "/clear":
-            os.system("clear")
+            # Clear screen and home the cursor without spawning /usr/bin/clear.
+            sys.stdout.write("\x1b[2J\x1b[H")
+            sys.stdout.flush()
             continue
 
         if cmd:
@@ -1,7 +1,7 @@
+import threading
 import time
 from pathlib import Path
-from Foundation import NSURL, NSRunLoop, NSDate, NSLocale
-import speech_recognition as sr
+from Foundation import NSURL, NSRunLoop, NSDate, NSLocale, NSOperationQueue
 
 # Native AVFoundation for "Bare Metal" Recording
 try:
@@ -40,10 +40,11 @@ def record_audio_native(output_path: Path, duration=5):
         session.setCategory_error_(AVAudioSessionCategoryPlayAndRecord, None)
         session.setActive_error_(True, None)
 
-        # Using WAV-style PCM settings for direct compatibility
+        # Using WAV-style PCM settings for direct compatibility.
+        # 16 kHz is what speech recognizers work at; higher rates only add bytes.
         settings = {
             AVFormatIDKey: kAudioFormatLinearPCM,
-            AVSampleRateKey: 44100.0,
+            AVSampleRateKey: 16000.0,
             AVNumberOfChannelsKey: 1,
             AVLinearPCMBitDepthKey: 16,
             AVLinearPCMIsBigEndianKey: False,
@@ -58,14 +59,19 @@ def record_audio_native(output_path: Path, duration=5):
         if not recorder.prepareToRecord():
             return False, "Recorder failed to prepare"
 
-        recorder.recordForDuration_(duration)
+        if not recorder.recordForDuration_(duration):
+            return False, "Recorder failed to start"
         
-        # Wait for recording to finish using the native run loop
-        loop = NSRunLoop.currentRunLoop()
-        end_time = time.time() + duration + 0.3
-        while time.time() < end_time:
-            loop.runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(0.1))
-            
+        # Wait for recording to finish using the native run loop: one call for the
+        # whole duration instead of polling every 100ms.
+        wait = duration + 0.3
+        deadline = time.monotonic() + wait
+        NSRunLoop.currentRunLoop().runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(wait))
+        # runUntilDate_ returns at once if nothing is attached to the run loop.
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
         recorder.stop()
         return True, None
     except Exception as e:
@@ -73,13 +79,21 @@ def record_audio_native(output_path: Path, duration=5):
 
 def transcribe_audio_google(audio_path: Path):
     """Transcribes an audio file using Google Speech Recognition (Fast, Free, No TCC Crash)."""
+    import wave
+
+    # Only needed for the Google fallback; the default native path never loads it.
+    import speech_recognition as sr
+
     r = sr.Recognizer()
     try:
-        with sr.AudioFile(str(audio_path)) as source:
-            audio_data = r.record(source)
-            # recognize (convert from speech to text)
-            text = r.recognize_google(audio_data)
-            return text, None
+        # The recording is plain 16-bit PCM WAV, so hand its frames straight to
+        # AudioData instead of going through AudioFile's format sniffing and chunked reads.
+        with wave.open(str(audio_path), "rb") as wav:
+            frames = wav.readframes(wav.getnframes())
+            audio_data = sr.AudioData(frames, wav.getframerate(), wav.getsampwidth())
+        # recognize (convert from speech to text)
+        text = r.recognize_google(audio_data)
+        return text, None
     except sr.UnknownValueError:
         return None, "Speech was unintelligible"
     except sr.RequestError as e:
@@ -88,62 +102,82 @@ def transcribe_audio_google(audio_path: Path):
         return None, f"Transcription error: {e}"
 
 
-def _request_speech_auth(timeout=5.0):
-    if not SFSpeechRecognizer:
-        return False, "Speech framework not available"
-    status_holder = {"done": False, "status": None}
+# Authorization and recognizers are kept for the process: the OS remembers the user's
+# answer, and a recognizer can run any number of tasks.
+_speech_authorized = False
+_recognizers = {}
+
+
+def _start_speech_auth():
+    """Fires the authorization request without waiting; the handler signals status_holder["done"]."""
+    status_holder = {"done": threading.Event(), "status": None}
 
     def handler(status):
-        status_holder["done"] = True
+        # Called on an arbitrary thread, so the waiter blocks on the event rather than the run loop.
         status_holder["status"] = status
+        status_holder["done"].set()
 
     SFSpeechRecognizer.requestAuthorization_(handler)
-    loop = NSRunLoop.currentRunLoop()
-    end_time = time.time() + timeout
-    while time.time() < end_time and not status_holder["done"]:
-        loop.runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(0.1))
+    return status_holder
 
-    if not status_holder["done"]:
+
+def _request_speech_auth(timeout=5.0, status_holder=None):
+    global _speech_authorized
+    if not SFSpeechRecognizer:
+        return False, "Speech framework not available"
+    if _speech_authorized:
+        return True, None
+    if status_holder is None:
+        status_holder = _start_speech_auth()
+    if not status_holder["done"].wait(timeout):
         return False, "Speech authorization timed out"
     if status_holder["status"] != SFSpeechRecognizerAuthorizationStatusAuthorized:
         return False, "Speech recognition not authorized"
+    _speech_authorized = True
     return True, None
 
 
-def transcribe_audio_native(audio_path: Path, locale="en-US"):
-    """Transcribes audio using macOS Speech framework."""
+def _recognizer(locale: str):
+    recognizer = _recognizers.get(locale)
+    if recognizer is None:
+        locale_obj = NSLocale.alloc().initWithLocaleIdentifier_(locale)
+        recognizer = SFSpeechRecognizer.alloc().initWithLocale_(locale_obj)
+        # Deliver results on a background queue so the caller can sleep until the final one.
+        recognizer.setQueue_(NSOperationQueue.alloc().init())
+        _recognizers[locale] = recognizer
+    return recognizer
+
+
+def transcribe_audio_native(audio_path: Path, locale="en-US", auth=None):
+    """Transcribes audio using macOS Speech framework (auth: a pending _start_speech_auth())."""
     if not SFSpeechRecognizer:
         return None, "Speech framework not available"
 
-    ok, err = _request_speech_auth()
+    ok, err = _request_speech_auth(status_holder=auth)
     if not ok:
         return None, err
 
     try:
-        locale_obj = NSLocale.alloc().initWithLocaleIdentifier_(locale)
-        recognizer = SFSpeechRecognizer.alloc().initWithLocale_(locale_obj)
+        recognizer = _recognizer(locale)
         request = SFSpeechURLRecognitionRequest.alloc().initWithURL_(
             NSURL.fileURLWithPath_(str(audio_path))
         )
 
-        result_holder = {"done": False, "text": None, "err": None}
+        result_holder = {"text": None, "err": None}
+        done = threading.Event()
 
         def handler(result, error):
             if error is not None:
                 result_holder["err"] = str(error)
-                result_holder["done"] = True
+                done.set()
                 return
             if result is not None:
                 result_holder["text"] = str(result.bestTranscription().formattedString())
                 if result.isFinal():
-                    result_holder["done"] = True
+                    done.set()
 
         recognizer.recognitionTaskWithRequest_resultHandler_(request, handler)
-
-        loop = NSRunLoop.currentRunLoop()
-        end_time = time.time() + 30.0
-        while time.time() < end_time and not result_holder["done"]:
-            loop.runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(0.1))
+        done.wait(30.0)
 
         if result_holder["err"]:
             return None, result_holder["err"]
@@ -152,29 +186,48 @@ def transcribe_audio_native(audio_path: Path, locale="en-US"):
         return None, f"Native speech error: {e}"
 
 
+_voice_tmp = None
+
+
+def _voice_tmp_path() -> Path:
+    """One private recording file per process, removed at exit; AVAudioRecorder overwrites it."""
+    global _voice_tmp
+    if _voice_tmp is None:
+        import atexit
+        import shutil
+        import tempfile
+
+        tmp_dir = tempfile.mkdtemp(prefix="openss_voice_")
+        atexit.register(shutil.rmtree, tmp_dir, True)
+        _voice_tmp = Path(tmp_dir) / "rec.wav"
+    return _voice_tmp
+
+
 def quick_voice_input(duration=5, engine="native"):
     """Native recording + native speech-to-text (fallback to Google if needed)."""
     # Use WAV for the temporary file for easiest processing
-    tmp_path = Path("/tmp/openss_voice.wav")
-    if tmp_path.exists():
-        tmp_path.unlink()
-        
+    tmp_path = _voice_tmp_path()
+    # The file is reused across recordings; never let a failed take transcribe the last one.
+    tmp_path.unlink(missing_ok=True)
+
+    # Ask for speech permission up front; the reply arrives during the recording,
+    # so transcription doesn't wait on it afterwards.
+    auth = None
+    if engine == "native" and SFSpeechRecognizer and not _speech_authorized:
+        auth = _start_speech_auth()
+
     success, err = record_audio_native(tmp_path, duration)
     if not success:
         return None, err
 
     text, err = (None, None)
     if engine == "native":
-        text, err = transcribe_audio_native(tmp_path)
+        text, err = transcribe_audio_native(tmp_path, auth=auth)
         if err:
             text = None
     if engine != "native" or text is None:
         text, err = transcribe_audio_google(tmp_path)
-    
-    # Cleanup
-    if tmp_path.exists():
-        tmp_path.unlink()
-        
+
     return text, err
 
 if __name__ == "__main__":
@@ -1,7 +1,12 @@
+import hashlib
 import os
+import queue
 import re
 import subprocess
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from openai import OpenAI
@@ -10,17 +15,21 @@ from watchdog.observers import Observer
 from dotenv import load_dotenv
 
 from .config import load_config
-from .cleanup import cleanup_old_screens
-from .db import add_message, create_session
+from .cleanup import start_background_cleanup
+from .db import add_messages, create_session
 
 # --- CONFIG ---
 CONFIG = load_config()
 MODEL = CONFIG["model"]
 SCREENSHOT_DIR = Path.home() / "Desktop"
+BATCH_MAX = 8  # screenshots handled per OCR batch
+BATCH_WAIT = 0.5  # seconds to wait for more screenshots after the first
+OCR_WORKERS = 4  # screenshots in a batch recognised in parallel
+RECENT_DIGESTS = 16  # recently handled screenshot contents remembered for de-duplication
 
 load_dotenv()
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-cleanup_old_screens()
+client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"), max_retries=3)
+start_background_cleanup()
 
 from Foundation import NSURL
 from Vision import (
@@ -31,21 +40,10 @@ from Vision import (
 )
 
 
-def ocr_image(path: Path) -> str:
-    lines = []
-
-    def handler(req, err):
-        if err and CONFIG["debug_ocr"]:
-            print("[OCR ERROR]", err)
-        if err:
-            return
-        for obs in req.results() or []:
-            cand = obs.topCandidates_(1)
-            if cand:
-                lines.append(str(cand[0].string()))
-
-    req = VNRecognizeTextRequest.alloc().initWithCompletionHandler_(handler)
-    level = CONFIG.get("ocr_recognition_level", "accurate")
+def make_ocr_request(level=None):
+    """Builds a configured text request; reusing it lets Vision keep its model loaded."""
+    req = VNRecognizeTextRequest.alloc().init()
+    level = level or CONFIG.get("ocr_recognition_level", "accurate")
     if level == "fast":
         req.setRecognitionLevel_(VNRequestTextRecognitionLevelFast)
     else:
@@ -54,46 +52,187 @@ def ocr_image(path: Path) -> str:
     langs = CONFIG.get("ocr_languages")
     if langs:
         req.setRecognitionLanguages_(langs)
+    return req
+
+
+_thread_state = threading.local()
+
+
+def _thread_ocr_request(level=None):
+    """One request per OCR thread and level: Vision requests must not be performed concurrently."""
+    requests = _thread_state.__dict__.setdefault("requests", {})
+    req = requests.get(level)
+    if req is None:
+        req = requests[level] = make_ocr_request(level)
+    return req
+
+
+def wait_until_written(path: Path, timeout: float = 3.0):
+    """Waits until the file size stops changing, i.e. macOS has finished writing the screenshot."""
+    deadline = time.monotonic() + timeout
+    last = -1
+    while time.monotonic() < deadline:
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = -1
+        if size > 0 and size == last:
+            return
+        last = size
+        time.sleep(0.05)
+
+
+def _recognize(handler, req):
+    """Runs req on handler; returns the recognised lines, or None if Vision failed."""
+    ok, err = handler.performRequests_error_([req], None)
+    if not ok:
+        if CONFIG["debug_ocr"]:
+            print("[OCR ERROR]", err)
+        return None
+    lines = []
+    for obs in req.results() or []:
+        cand = obs.topCandidates_(1)
+        if cand:
+            lines.append(str(cand[0].string()))
+    return lines
+
+
+def ocr_image(path: Path, req=None) -> str:
+    if req is None:
+        req = make_ocr_request()
 
     url = NSURL.fileURLWithPath_(str(path))
     h = VNImageRequestHandler.alloc().initWithURL_options_(url, None)
-    h.performRequests_error_([req], None)
-
-    return "\n".join(lines)
+    lines = _recognize(h, req)
+    if (
+        lines == []
+        and req.recognitionLevel() == VNRequestTextRecognitionLevelFast
+        and CONFIG.get("ocr_accurate_fallback", True)
+    ):
+        # Fast mode can miss small or stylised text entirely; retry once on the same handler.
+        lines = _recognize(h, _thread_ocr_request("accurate"))
+    return "\n".join(lines or ())
 
 
-def ask(text: str) -> str:
+def ask(text: str, on_token=None) -> str:
     prompt = CONFIG["prompt_watch"].format(text=text)
-    r = client.responses.create(model=MODEL, input=prompt)
-    return r.output_text.strip()
+    if on_token is None:
+        r = client.responses.create(model=MODEL, input=prompt)
+        return r.output_text.strip()
+    parts = []
+    with client.responses.stream(model=MODEL, input=prompt) as stream:
+        for event in stream:
+            if event.type == "response.output_text.delta":
+                parts.append(event.delta)
+                on_token(event.delta)
+    return "".join(parts).strip()
+
+
+def _print_token(token: str):
+    print(token, end="", flush=True)
+
+
+_CODE_BLOCK_RE = re.compile(r"```(?:[a-zA-Z0-9_+-]+)?\n(.*?)\n?```", re.DOTALL)
 
 
 def extract_first_code_block(text: str) -> str:
-    matches = re.findall(r"```(?:[a-zA-Z0-9_+-]+)?\\n(.*?)```", text, re.DOTALL)
-    return matches[0].strip() if matches else ""
+    if "```" not in text:
+        return ""
+    m = _CODE_BLOCK_RE.search(text)
+    return m.group(1).strip() if m else ""
 
 
 def copy_to_clipboard(text: str):
     if not text:
         return
-    subprocess.run(["pbcopy"], input=text.encode("utf-8"), check=True)
+    try:
+        from AppKit import NSPasteboard, NSPasteboardTypeString
+    except ImportError:
+        subprocess.run(["pbcopy"], input=text.encode("utf-8"), check=True)
+        return
+    # Write the pasteboard in-process instead of spawning pbcopy for every copy.
+    pb = NSPasteboard.generalPasteboard()
+    pb.clearContents()
+    pb.setString_forType_(text, NSPasteboardTypeString)
 
 
 class Handler(FileSystemEventHandler):
+    def __init__(self):
+        super().__init__()
+        # Screenshots are handled off the watchdog thread, batched so a burst shares OCR workers.
+        self._pending = queue.Queue()
+        self._recent = OrderedDict()
+        self._recent_lock = threading.Lock()
+        threading.Thread(target=self._worker, daemon=True).start()
+
     def on_created(self, event):
         p = Path(event.src_path)
         if not p.name.lower().startswith("screenshot"):
             return
-        time.sleep(0.3)
+        self._pending.put(p)
+
+    def _collect_batch(self) -> list:
+        batch = [self._pending.get()]
+        deadline = time.monotonic() + BATCH_WAIT
+        while len(batch) < BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
 
+    def _is_new_content(self, p: Path) -> bool:
+        """False for files too small to hold text, or identical to a recent screenshot."""
+        data = p.read_bytes()
+        if len(data) < CONFIG.get("min_ocr_bytes", 1024):
+            return False
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        with self._recent_lock:
+            if digest in self._recent:
+                self._recent.move_to_end(digest)
+                return False
+            self._recent[digest] = None
+            if len(self._recent) > RECENT_DIGESTS:
+                self._recent.popitem(last=False)
+        return True
+
+    def _ocr(self, p: Path):
+        """OCR text for p, or None when the screenshot is skipped."""
+        try:
+            wait_until_written(p)
+            if not self._is_new_content(p):
+                return None
+            return ocr_image(p, _thread_ocr_request())
+        except Exception as e:
+            print(f"[OCR ERROR] {p.name}: {e}")
+            return ""
+
+    def _worker(self):
+        with ThreadPoolExecutor(max_workers=OCR_WORKERS) as pool:
+            while True:
+                batch = self._collect_batch()
+                # Recognise the whole burst in parallel; answers still print one screenshot at a time.
+                for p, txt in zip(batch, pool.map(self._ocr, batch)):
+                    try:
+                        self._process(p, txt)
+                    except Exception as e:
+                        print(f"[ERROR] {p.name}: {e}")
+
+    def _process(self, p: Path, txt):
+        if txt is None:
+            # Tiny file, or the same image saved twice (macOS can report one save as two events).
+            if CONFIG["debug_ocr"]:
+                print(f"[OCR DEBUG] skipped {p.name}")
+            return
         print("\n--- Screenshot detected ---")
-        txt = ocr_image(p)
         if not txt.strip():
             print("No text.")
             return
 
         session_id = create_session(time.strftime("Screenshot session %Y-%m-%d %H:%M:%S"))
-        add_message(session_id, "user", txt, str(p))
 
         if CONFIG["debug_ocr"]:
             size = p.stat().st_size if p.exists() else 0
@@ -101,9 +240,10 @@ class Handler(FileSystemEventHandler):
 
         print("\n[OCR]\n", txt[: CONFIG["max_ocr_preview"]])
         print("\n[AI]\n")
-        ans = ask(txt)
-        print(ans)
-        add_message(session_id, "assistant", ans)
+        # Print the answer as it streams in rather than after the whole completion.
+        ans = ask(txt, on_token=_print_token)
+        print()
+        add_messages(session_id, [("user", txt, str(p)), ("assistant", ans)])
         code_block = extract_first_code_block(ans)
         if code_block:
             print("\n[CODE DETECTED]\n")